@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import argparse
+import re
+import subprocess
+import sys
+import typing as T
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LAZY_MODULES = [
+    "numpy",
+    "pyqtcolordialog.color_preview",
+    "pyqtcolordialog.color_ring",
+    "pyqtcolordialog.color_sliders",
+    "pyqtcolordialog.color_square",
+    "pyqtcolordialog.screen_color_picker",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-s", "--statement", default="from pyqtcolordialog import QColorDialog"
+    )
+    parser.add_argument("--max-ms", type=float)
+    return parser.parse_args()
+
+
+def import_times(statement: str) -> T.Dict[str, T.Tuple[int, float]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=str(ROOT),
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times: T.Dict[str, T.Tuple[int, float]] = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)", line)
+        if match:
+            depth = (len(match.group(2)) - 1) // 2
+            times[match.group(3)] = (depth, int(match.group(1)) / 1000)
+    return times
+
+
+def main() -> None:
+    args = parse_args()
+    times = import_times(args.statement)
+    total = sum(
+        cumulative
+        for name, (depth, cumulative) in times.items()
+        if depth == 0 and name.startswith("pyqtcolordialog")
+    )
+    print(f"{args.statement}: {total:.3f} ms")
+
+    failed = False
+    for name in LAZY_MODULES:
+        if name in times:
+            print(f"eagerly imported: {name} ({times[name][1]:.3f} ms)")
+            failed = True
+    if args.max_ms is not None and total > args.max_ms:
+        print(f"import took longer than {args.max_ms:.3f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
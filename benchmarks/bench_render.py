@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+import typing as T
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtCore, QtGui, QtWidgets  # noqa: E402
+from PyQt5.QtTest import QTest  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pyqtcolordialog import QColorDialog  # noqa: E402
+from pyqtcolordialog.alpha_grid import AlphaGrid  # noqa: E402
+from pyqtcolordialog.color_model import ColorModel  # noqa: E402
+from pyqtcolordialog.color_preview import ColorPreview  # noqa: E402
+from pyqtcolordialog.color_ring import ColorRing  # noqa: E402
+from pyqtcolordialog.color_sliders import (  # noqa: E402
+    AlphaColorControl,
+    BlueColorControl,
+    GreenColorControl,
+    HueColorControl,
+    RedColorControl,
+    SaturationColorControl,
+    ValueColorControl,
+)
+from pyqtcolordialog.color_square import (  # noqa: E402
+    ColorSquare,
+    ColorSquareStyle,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--iterations", type=int, default=50)
+    parser.add_argument("--drag-events", type=int, default=500)
+    parser.add_argument("--open-iterations", type=int, default=10)
+    parser.add_argument("-o", "--output", type=Path)
+    parser.add_argument("-c", "--compare", type=Path)
+    return parser.parse_args()
+
+
+def time_paints(
+    widget: QtWidgets.QWidget,
+    step: T.Callable[[int], None],
+    iterations: int,
+) -> T.Dict[str, float]:
+    image = QtGui.QImage(widget.size(), QtGui.QImage.Format_ARGB32)
+    widget.render(image)
+    timings: T.List[float] = []
+    for i in range(iterations):
+        step(i)
+        start = time.perf_counter()
+        widget.render(image)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": statistics.mean(timings),
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+    }
+
+
+def bench_paints(iterations: int) -> T.Dict[str, T.Dict[str, float]]:
+    results: T.Dict[str, T.Dict[str, float]] = {}
+    model = ColorModel(QtGui.QColor(202, 224, 250))
+    alpha_grid = AlphaGrid()
+
+    def move_sv(i: int) -> None:
+        model.set_hsva(model.h, (i % 100) / 100, 1 - (i % 50) / 100)
+
+    def move_h(i: int) -> None:
+        model.h = (i % 360) / 360
+
+    ring = ColorRing(None, model)
+    results["ring.sv"] = time_paints(ring, move_sv, iterations)
+    results["ring.hue"] = time_paints(ring, move_h, iterations)
+
+    for square_style in ColorSquareStyle:
+        square = ColorSquare(None, model, square_style)
+        name = f"square.{square_style.name.lower()}"
+        results[name + ".marker"] = time_paints(
+            square,
+            lambda i: square._sync(QtCore.QPoint(i % 300, i)),
+            iterations,
+        )
+        channel = square_style.name[0].lower()
+        results[name + ".plane"] = time_paints(
+            square,
+            lambda i: setattr(model, channel, (i % 100) / 100),
+            iterations,
+        )
+
+    for control_type in [
+        HueColorControl,
+        SaturationColorControl,
+        ValueColorControl,
+        RedColorControl,
+        GreenColorControl,
+        BlueColorControl,
+        AlphaColorControl,
+    ]:
+        control = control_type(None, model, alpha_grid)
+        control.resize(control.sizeHint())
+        name = "slider." + control_type.__name__[: -len("ColorControl")]
+        results[name.lower()] = time_paints(
+            control._slider, move_h, iterations
+        )
+
+    preview = ColorPreview(None, model.color, model, alpha_grid)
+    preview.resize(preview.sizeHint())
+    results["preview"] = time_paints(preview, move_h, iterations)
+    return results
+
+
+def send_mouse_event(
+    widget: QtWidgets.QWidget,
+    event_type: QtCore.QEvent.Type,
+    pos: QtCore.QPoint,
+    button: QtCore.Qt.MouseButton = QtCore.Qt.NoButton,
+    buttons: QtCore.Qt.MouseButtons = QtCore.Qt.LeftButton,
+) -> None:
+    event = QtGui.QMouseEvent(
+        event_type, QtCore.QPointF(pos), button, buttons, QtCore.Qt.NoModifier
+    )
+    QtWidgets.QApplication.sendEvent(widget, event)
+
+
+def drag(
+    app: QtWidgets.QApplication,
+    widget: QtWidgets.QWidget,
+    points: T.List[QtCore.QPoint],
+) -> T.Dict[str, float]:
+    send_mouse_event(
+        widget, QtCore.QEvent.MouseButtonPress, points[0], QtCore.Qt.LeftButton
+    )
+    start = time.perf_counter()
+    for point in points:
+        send_mouse_event(widget, QtCore.QEvent.MouseMove, point)
+        app.processEvents()
+    send_mouse_event(
+        widget,
+        QtCore.QEvent.MouseButtonRelease,
+        points[-1],
+        QtCore.Qt.LeftButton,
+        QtCore.Qt.NoButton,
+    )
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    return {"events": len(points), "events_per_sec": len(points) / elapsed}
+
+
+def bench_drags(
+    app: QtWidgets.QApplication, events: int
+) -> T.Dict[str, T.Dict[str, float]]:
+    results: T.Dict[str, T.Dict[str, float]] = {}
+    dialog = QColorDialog(QtGui.QColor(202, 224, 250))
+    dialog.setFrameInterval(0)
+    dialog.show()
+    QTest.qWaitForWindowExposed(dialog)
+
+    dialog.setUseSquareView(False)
+    app.processEvents()
+    ring = dialog._color_ring
+    center = ring.rect().center()
+    results["drag.ring.triangle"] = drag(
+        app,
+        ring,
+        [
+            center + QtCore.QPoint(i % 40 - 20, (i // 40) % 40 - 20)
+            for i in range(events)
+        ],
+    )
+    results["drag.ring.hue"] = drag(
+        app,
+        ring,
+        [
+            center
+            + QtCore.QPoint(
+                round(130 * math.cos(i / 50)), round(130 * math.sin(i / 50))
+            )
+            for i in range(events)
+        ],
+    )
+
+    dialog.setUseSquareView(True)
+    app.processEvents()
+    square = dialog._color_square
+    results["drag.square"] = drag(
+        app,
+        square,
+        [QtCore.QPoint(i % 300, (i * 7) % 300) for i in range(events)],
+    )
+    dialog.close()
+    return results
+
+
+def bench_open(
+    app: QtWidgets.QApplication, iterations: int
+) -> T.Dict[str, T.Dict[str, float]]:
+    results: T.Dict[str, T.Dict[str, float]] = {}
+    for name, use_square_view in [("ring", False), ("square", True)]:
+        timings: T.List[float] = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            dialog = QColorDialog(QtGui.QColor(202, 224, 250))
+            dialog.setOptions(QColorDialog.ColorDialogOptions())
+            dialog.setUseSquareView(use_square_view)
+            dialog.show()
+            dialog.repaint()
+            timings.append((time.perf_counter() - start) * 1000)
+            dialog.close()
+            dialog.deleteLater()
+            app.processEvents()
+        results[f"open.{name}"] = {
+            "mean_ms": statistics.mean(timings),
+            "median_ms": statistics.median(timings),
+            "min_ms": min(timings),
+            "max_ms": max(timings),
+        }
+    return results
+
+
+class PaintWatcher(QtCore.QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self.painted = False
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if event.type() == QtCore.QEvent.Paint and isinstance(
+            obj, (ColorRing, ColorSquare)
+        ):
+            self.painted = True
+        return False
+
+
+def bench_first_paint(
+    app: QtWidgets.QApplication, iterations: int
+) -> T.Dict[str, T.Dict[str, float]]:
+    results: T.Dict[str, T.Dict[str, float]] = {}
+    watcher = PaintWatcher()
+    app.installEventFilter(watcher)
+    for name, use_square_view in [("ring", False), ("square", True)]:
+        timings: T.List[float] = []
+        for _ in range(iterations):
+            watcher.painted = False
+            start = time.perf_counter()
+            dialog = QColorDialog(QtGui.QColor(202, 224, 250))
+            dialog.setOptions(QColorDialog.ColorDialogOptions())
+            dialog.setUseSquareView(use_square_view)
+            dialog.show()
+            while not watcher.painted:
+                app.processEvents(QtCore.QEventLoop.WaitForMoreEvents, 10)
+            timings.append((time.perf_counter() - start) * 1000)
+            dialog.close()
+            dialog.deleteLater()
+            app.processEvents()
+        results[f"first_paint.{name}"] = {
+            "mean_ms": statistics.mean(timings),
+            "median_ms": statistics.median(timings),
+            "min_ms": min(timings),
+            "max_ms": max(timings),
+        }
+    app.removeEventFilter(watcher)
+    return results
+
+
+def bench_memory(app: QtWidgets.QApplication) -> T.Dict[str, float]:
+    tracemalloc.start()
+    bench_paints(1)
+    bench_drags(app, 10)
+    bench_open(app, 1)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "python_peak_kib": peak / 1024,
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def compare(baseline: T.Dict[str, T.Any], current: T.Dict[str, T.Any]) -> None:
+    for section in ["paint", "open"]:
+        for name, result in sorted(current[section].items()):
+            old = baseline.get(section, {}).get(name)
+            if old is None:
+                continue
+            ratio = result["median_ms"] / max(old["median_ms"], 1e-9)
+            print(
+                f"{name:32} {old['median_ms']:9.3f} ms -> "
+                f"{result['median_ms']:9.3f} ms  x{ratio:.2f}"
+            )
+    for name, result in sorted(current["drag"].items()):
+        old = baseline.get("drag", {}).get(name)
+        if old is None:
+            continue
+        ratio = result["events_per_sec"] / max(old["events_per_sec"], 1e-9)
+        print(
+            f"{name:32} {old['events_per_sec']:9.0f} ev/s -> "
+            f"{result['events_per_sec']:9.0f} ev/s  x{ratio:.2f}"
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    app = QtWidgets.QApplication(sys.argv)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QtCore.QT_VERSION_STR,
+            "pyqt": QtCore.PYQT_VERSION_STR,
+            "platform": app.platformName(),
+            "iterations": args.iterations,
+        },
+        "paint": bench_paints(args.iterations),
+        "drag": bench_drags(app, args.drag_events),
+        "open": {
+            **bench_open(app, args.open_iterations),
+            **bench_first_paint(app, args.open_iterations),
+        },
+    }
+    results["memory"] = bench_memory(app)
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), results)
+    else:
+        for name, result in sorted(results["paint"].items()):
+            print(f"{name:32} {result['median_ms']:9.3f} ms")
+        for name, result in sorted(results["drag"].items()):
+            print(f"{name:32} {result['events_per_sec']:9.0f} ev/s")
+        for name, result in sorted(results["open"].items()):
+            print(f"{name:32} {result['median_ms']:9.3f} ms")
+        for name, value in results["memory"].items():
+            print(f"{name:32} {value:9.0f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,14 @@
-from .color_dialog import QColorDialog
+import typing as T
+
+if T.TYPE_CHECKING:
+    from .color_dialog import QColorDialog
+
+__all__ = ["QColorDialog"]
+
+
+def __getattr__(name: str) -> T.Any:
+    if name == "QColorDialog":
+        from .color_dialog import QColorDialog
+
+        return QColorDialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 import argparse
+import cProfile
+import json
+import os
+import pstats
 import sys
 import typing as T
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 # from PyQt5.QtWidgets import QColorDialog
-from pyqtcolordialog import QColorDialog
+from pyqtcolordialog import QColorDialog, profiling
 
 
 def parse_args() -> argparse.Namespace:
@@ -17,6 +21,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--no-buttons", action="store_false", dest="buttons")
     parser.add_argument("--square", action="store_true")
     parser.add_argument("--no-square", action="store_false", dest="square")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--profile-output", metavar="PATH")
     parser.set_defaults(alpha=True, buttons=True, square=False)
     return parser.parse_args()
 
@@ -40,6 +46,14 @@ def main() -> None:
     options = QColorDialog.ColorDialogOptions()
     options = set_bit(options, QColorDialog.ShowAlphaChannel, args.alpha)
     options = set_bit(options, QColorDialog.NoButtons, not args.buttons)
+
+    if args.profile or profiling.enabled_by_env():
+        profiler = profiling.enable()
+        session = cProfile.Profile()
+        session.enable()
+    else:
+        profiler = None
+
     color = QColorDialog.getColor(
         initial=QtGui.QColor(202, 224, 250),
         title="Fancy title...",
@@ -47,6 +61,18 @@ def main() -> None:
         use_square_view=args.square,
     )
 
+    if profiler is not None:
+        session.disable()
+        print(profiler.report(), file=sys.stderr)
+        stats = pstats.Stats(session, stream=sys.stderr)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(25)
+        if args.profile_output:
+            session.dump_stats(args.profile_output)
+            with open(
+                os.path.splitext(args.profile_output)[0] + ".json", "w"
+            ) as handle:
+                json.dump(profiler.stats(), handle, indent=4)
+
     print(color.isValid())
     print(f"{color.red():02x}{color.green():02x}{color.blue():02x}")
 
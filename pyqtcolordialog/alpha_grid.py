@@ -0,0 +1,69 @@
+import collections
+import functools
+import typing as T
+from pathlib import Path
+
+from PyQt5 import QtCore, QtGui
+
+
+@functools.lru_cache(maxsize=None)
+def default_alpha_grid() -> QtGui.QPixmap:
+    return QtGui.QPixmap(str(Path(__file__).parent / "grid.png"))
+
+
+_TILED_CACHE_SIZE = 32
+_tiled: T.MutableMapping[T.Tuple[int, int, int, float], QtGui.QPixmap] = (
+    collections.OrderedDict()
+)
+
+
+def tile_pixmap(
+    pixmap: QtGui.QPixmap, size: QtCore.QSize, device_pixel_ratio: float = 1.0
+) -> QtGui.QPixmap:
+    key = (pixmap.cacheKey(), size.width(), size.height(), device_pixel_ratio)
+    tiled = _tiled.get(key)
+    if tiled is not None:
+        _tiled.move_to_end(key)
+        return tiled
+    tiled = QtGui.QPixmap(
+        max(1, int(size.width() * device_pixel_ratio)),
+        max(1, int(size.height() * device_pixel_ratio)),
+    )
+    tiled.setDevicePixelRatio(device_pixel_ratio)
+    tiled.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(tiled)
+    painter.drawTiledPixmap(
+        QtCore.QRect(0, 0, size.width(), size.height()), pixmap
+    )
+    painter.end()
+    _tiled[key] = tiled
+    if len(_tiled) > _TILED_CACHE_SIZE:
+        _tiled.popitem(last=False)
+    return tiled
+
+
+class AlphaGrid(QtCore.QObject):
+    changed = QtCore.pyqtSignal()
+
+    def __init__(
+        self,
+        pixmap: T.Optional[QtGui.QPixmap] = None,
+        parent: T.Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._pixmap = pixmap if pixmap is not None else default_alpha_grid()
+
+    @property
+    def pixmap(self) -> QtGui.QPixmap:
+        return self._pixmap
+
+    def set_pixmap(self, pixmap: QtGui.QPixmap) -> None:
+        if pixmap.cacheKey() == self._pixmap.cacheKey():
+            return
+        self._pixmap = QtGui.QPixmap(pixmap)
+        self.changed.emit()
+
+    def tiled(
+        self, size: QtCore.QSize, device_pixel_ratio: float = 1.0
+    ) -> QtGui.QPixmap:
+        return tile_pixmap(self._pixmap, size, device_pixel_ratio)
@@ -0,0 +1,193 @@
+import typing as T
+
+import numpy as np
+from PyQt5 import QtCore
+
+from . import raster
+from .color_model import BLACK_THRESHOLD, LINEAR_LUT, LINEAR_LUT_SIZE
+
+_LINEAR_LUT = np.array(LINEAR_LUT, np.float64)
+_LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], np.float64)
+
+
+def to_unit(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.asarray(rgb)
+    if np.issubdtype(rgb.dtype, np.integer):
+        return np.clip(rgb / 255.0, 0.0, 1.0)
+    if np.issubdtype(rgb.dtype, np.floating):
+        return np.clip(rgb.astype(np.float64, copy=False), 0.0, 1.0)
+    raise TypeError(f"unsupported color array dtype: {rgb.dtype}")
+
+
+def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    index = np.rint(to_unit(rgb)[..., :3] * (LINEAR_LUT_SIZE - 1))
+    return _LINEAR_LUT[index.astype(np.intp)] @ _LUMINANCE_WEIGHTS
+
+
+def contrast_ratio(rgb1: np.ndarray, rgb2: np.ndarray) -> np.ndarray:
+    l1 = relative_luminance(rgb1)
+    l2 = relative_luminance(rgb2)
+    return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+
+
+def black_or_white(rgb: np.ndarray) -> np.ndarray:
+    return np.where(
+        relative_luminance(rgb) > BLACK_THRESHOLD,
+        int(QtCore.Qt.black),
+        int(QtCore.Qt.white),
+    )
+
+
+def _split_alpha(
+    values: np.ndarray,
+) -> T.Tuple[np.ndarray, T.Optional[np.ndarray]]:
+    values = np.clip(np.asarray(values, np.float64), 0.0, 1.0)
+    if values.shape[-1] == 4:
+        return values[..., :3], values[..., 3]
+    if values.shape[-1] != 3:
+        raise ValueError(f"expected 3 or 4 channels, got {values.shape[-1]}")
+    return values, None
+
+
+def _join_alpha(
+    values: np.ndarray, alpha: T.Optional[np.ndarray]
+) -> np.ndarray:
+    if alpha is None:
+        return values
+    return np.concatenate([values, alpha[..., None]], axis=-1)
+
+
+def hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    hsv, alpha = _split_alpha(hsv)
+    rgb = raster.hsv_to_rgb(hsv[..., 0], hsv[..., 1], hsv[..., 2])
+    return _join_alpha(rgb, alpha)
+
+
+def rgb_to_hsv(rgb: np.ndarray) -> np.ndarray:
+    rgb, alpha = _split_alpha(rgb)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    max_c = rgb.max(axis=-1)
+    delta = max_c - rgb.min(axis=-1)
+    chromatic = delta > 0.0
+    safe_delta = np.where(chromatic, delta, 1.0)
+    h = np.where(
+        r == max_c,
+        (g - b) / safe_delta,
+        np.where(
+            g == max_c, 2 + (b - r) / safe_delta, 4 + (r - g) / safe_delta
+        ),
+    )
+    h = np.where(chromatic, (h / 6) % 1.0, 0.0)
+    s = np.where(chromatic, delta / np.where(chromatic, max_c, 1.0), 0.0)
+    return _join_alpha(np.stack([h, s, max_c], axis=-1), alpha)
+
+
+def to_rgba8(rgb: np.ndarray) -> np.ndarray:
+    rgb, alpha = _split_alpha(rgb)
+    if alpha is None:
+        alpha = np.ones(rgb.shape[:-1])
+    rgba = np.concatenate([rgb, alpha[..., None]], axis=-1)
+    rgba16 = np.floor(rgba * 0xFFFF + 0.5).astype(np.uint32)
+    return ((rgba16 + 0x80 - ((rgba16 + 0x80) >> 8)) >> 8).astype(np.uint8)
+
+
+def from_rgba8(rgba: np.ndarray) -> np.ndarray:
+    rgba = np.asarray(rgba, np.uint8)
+    return rgba.astype(np.float64) * 0x101 / 0xFFFF
+
+
+def to_argb32(rgb: np.ndarray) -> np.ndarray:
+    rgba = to_rgba8(rgb).astype(np.uint32)
+    return (
+        (rgba[..., 3] << 24)
+        | (rgba[..., 0] << 16)
+        | (rgba[..., 1] << 8)
+        | rgba[..., 2]
+    )
+
+
+def from_argb32(argb: np.ndarray) -> np.ndarray:
+    argb = np.asarray(argb, np.uint32)
+    rgba = np.stack([argb >> 16, argb >> 8, argb, argb >> 24], axis=-1).astype(
+        np.uint8
+    )
+    return from_rgba8(rgba)
+
+
+_HEX_DIGITS = np.array([f"{i:02x}" for i in range(256)])
+_NIBBLES = np.full(256, 0xFF, np.uint8)
+for _digit in range(16):
+    _NIBBLES[ord(f"{_digit:x}")] = _digit
+    _NIBBLES[ord(f"{_digit:X}")] = _digit
+
+
+def to_hex(rgb: np.ndarray, with_alpha: bool = False) -> np.ndarray:
+    rgba = to_rgba8(rgb)
+    channels = [3, 0, 1, 2] if with_alpha else [0, 1, 2]
+    names = np.full(rgba.shape[:-1], "#", dtype="<U9")
+    for channel in channels:
+        names = np.char.add(names, _HEX_DIGITS[rgba[..., channel]])
+    return names
+
+
+def from_hex(names: T.Union[np.ndarray, T.Sequence[str]]) -> np.ndarray:
+    names = np.char.lstrip(np.asarray(names, dtype="U"), "#")
+    lengths = np.char.str_len(names)
+    encoded = np.char.encode(names, "ascii").astype("S8")
+    chars = encoded.view(np.uint8).reshape(encoded.shape + (8,))
+    nibbles = _NIBBLES[chars].astype(np.uint32)
+    rgba = np.empty(names.shape + (4,), np.uint32)
+    short = lengths == 3
+    rgba[short, :3] = nibbles[short, :3] * 0x11
+    rgba[short, 3] = 0xFF
+    rrggbb = lengths == 6
+    pairs = nibbles[..., 0::2] << 4 | nibbles[..., 1::2]
+    rgba[rrggbb, :3] = pairs[rrggbb, :3]
+    rgba[rrggbb, 3] = 0xFF
+    aarrggbb = lengths == 8
+    rgba[aarrggbb, :3] = pairs[aarrggbb, 1:]
+    rgba[aarrggbb, 3] = pairs[aarrggbb, 0]
+    valid = (short | rrggbb | aarrggbb) & np.all(
+        (nibbles != 0xFF) | (np.arange(8) >= lengths[..., None]), axis=-1
+    )
+    if not np.all(valid):
+        invalid = np.asarray(names)[~valid]
+        raise ValueError(f"invalid color name: #{invalid.flat[0]}")
+    return from_rgba8(rgba.astype(np.uint8))
+
+
+_OKLAB_LMS = np.array(
+    [
+        [0.4122214708, 0.5363325363, 0.0514459929],
+        [0.2119034982, 0.6806995451, 0.1073969566],
+        [0.0883024619, 0.2817188376, 0.6299787005],
+    ]
+)
+_OKLAB_LAB = np.array(
+    [
+        [0.2104542553, 0.7936177850, -0.0040720468],
+        [1.9779984951, -2.4285922050, 0.4505937099],
+        [0.0259040371, 0.7827717662, -0.8086757660],
+    ]
+)
+
+
+def to_linear(rgb: np.ndarray) -> np.ndarray:
+    rgb = to_unit(rgb)
+    return np.where(
+        rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4
+    )
+
+
+def to_oklab(rgb: np.ndarray) -> np.ndarray:
+    lms = to_linear(to_unit(rgb)[..., :3]) @ _OKLAB_LMS.T
+    return np.cbrt(lms) @ _OKLAB_LAB.T
+
+
+def from_linear(linear: np.ndarray) -> np.ndarray:
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(
+        linear <= 0.0031308,
+        linear * 12.92,
+        1.055 * linear ** (1 / 2.4) - 0.055,
+    )
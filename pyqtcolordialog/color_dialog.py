@@ -1,23 +1,20 @@
 import functools
 import typing as T
-from pathlib import Path
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets, sip
 
+from . import profiling
+from .alpha_grid import AlphaGrid, default_alpha_grid
 from .color_model import ColorModel
-from .color_preview import ColorPreview
-from .color_ring import ColorRing
-from .color_sliders import (
-    AlphaColorControl,
-    BlueColorControl,
-    GreenColorControl,
-    HueColorControl,
-    RedColorControl,
-    SaturationColorControl,
-    ValueColorControl,
-)
-from .color_square import ColorSquare, ColorSquareStyle
-from .screen_color_picker import ScreenColorPicker
+from .scheduler import DEFAULT_INTERVAL, FrameScheduler
+
+if T.TYPE_CHECKING:
+    from .color_names import ColorNameIndex
+    from .color_ring import ColorRing
+    from .color_square import ColorSquare, ColorSquareStyle
+    from .palette import Palette
+    from .screen_color_picker import SampleMethod
+    from .swatches import SwatchArea
 
 
 class ButtonStrip(QtWidgets.QDialogButtonBox):
@@ -57,10 +54,24 @@ class SlidersControl(QtWidgets.QWidget):
         self,
         parent: QtWidgets.QWidget,
         model: ColorModel,
-        alpha_grid: QtGui.QPixmap,
+        alpha_grid: AlphaGrid,
+        scheduler: T.Optional[FrameScheduler] = None,
     ) -> None:
+        from .color_sliders import (
+            BlueColorControl,
+            GreenColorControl,
+            HueColorControl,
+            RedColorControl,
+            SaturationColorControl,
+            ValueColorControl,
+        )
+        from .color_square import ColorSquareStyle
+
         super().__init__(parent)
-        layout = QtWidgets.QGridLayout(self)
+        self._model = model
+        self._alpha_grid = alpha_grid
+        self._scheduler = scheduler
+        self._layout = layout = QtWidgets.QGridLayout(self)
         layout.setSpacing(8)
         layout.setContentsMargins(0, 0, 0, 0)
 
@@ -93,9 +104,15 @@ class SlidersControl(QtWidgets.QWidget):
         layout.addWidget(self.labels[ColorSquareStyle.Hue], 0, 1)
         layout.addWidget(self.labels[ColorSquareStyle.Saturation], 1, 1)
         layout.addWidget(self.labels[ColorSquareStyle.Value], 2, 1)
-        layout.addWidget(HueColorControl(self, model, alpha_grid), 0, 2)
-        layout.addWidget(SaturationColorControl(self, model, alpha_grid), 1, 2)
-        layout.addWidget(ValueColorControl(self, model, alpha_grid), 2, 2)
+        layout.addWidget(
+            HueColorControl(self, model, alpha_grid, scheduler), 0, 2
+        )
+        layout.addWidget(
+            SaturationColorControl(self, model, alpha_grid, scheduler), 1, 2
+        )
+        layout.addWidget(
+            ValueColorControl(self, model, alpha_grid, scheduler), 2, 2
+        )
 
         layout.addWidget(QtWidgets.QFrame(self), 3, 1, 1, 2)
 
@@ -105,18 +122,34 @@ class SlidersControl(QtWidgets.QWidget):
         layout.addWidget(self.labels[ColorSquareStyle.Red], 4, 1)
         layout.addWidget(self.labels[ColorSquareStyle.Green], 5, 1)
         layout.addWidget(self.labels[ColorSquareStyle.Blue], 6, 1)
-        layout.addWidget(RedColorControl(self, model, alpha_grid), 4, 2)
-        layout.addWidget(GreenColorControl(self, model, alpha_grid), 5, 2)
-        layout.addWidget(BlueColorControl(self, model, alpha_grid), 6, 2)
+        layout.addWidget(
+            RedColorControl(self, model, alpha_grid, scheduler), 4, 2
+        )
+        layout.addWidget(
+            GreenColorControl(self, model, alpha_grid, scheduler), 5, 2
+        )
+        layout.addWidget(
+            BlueColorControl(self, model, alpha_grid, scheduler), 6, 2
+        )
+
+        self.alpha_widgets: T.List[QtWidgets.QWidget] = []
 
-        self.alpha_widgets = [
-            QtWidgets.QFrame(self),
-            QtWidgets.QLabel("Opacity:", self),
-            AlphaColorControl(self, model, alpha_grid),
-        ]
-        layout.addWidget(self.alpha_widgets[0], 7, 0, 1, 2)
-        layout.addWidget(self.alpha_widgets[1], 8, 1)
-        layout.addWidget(self.alpha_widgets[2], 8, 2)
+    def set_alpha_visible(self, visible: bool) -> None:
+        if visible and not self.alpha_widgets:
+            from .color_sliders import AlphaColorControl
+
+            self.alpha_widgets = [
+                QtWidgets.QFrame(self),
+                QtWidgets.QLabel("Opacity:", self),
+                AlphaColorControl(
+                    self, self._model, self._alpha_grid, self._scheduler
+                ),
+            ]
+            self._layout.addWidget(self.alpha_widgets[0], 7, 0, 1, 2)
+            self._layout.addWidget(self.alpha_widgets[1], 8, 1)
+            self._layout.addWidget(self.alpha_widgets[2], 8, 2)
+        for widget in self.alpha_widgets:
+            widget.setVisible(visible)
 
 
 class QColorDialog(QtWidgets.QDialog):
@@ -129,40 +162,54 @@ class QColorDialog(QtWidgets.QDialog):
     colorSelected = QtCore.pyqtSignal(QtGui.QColor)
     currentColorChanged = QtCore.pyqtSignal(QtGui.QColor)
 
+    _pool: T.List["QColorDialog"] = []
+    _pool_size = 0
+
     def __init__(
         self,
         initial: T.Optional[QtGui.QColor] = None,
         parent: QtWidgets.QWidget = None,
     ) -> None:
+        from .color_preview import ColorPreview
+        from .color_square import ColorSquareStyle
+        from .screen_color_picker import ScreenColorPicker
+
         super().__init__(parent)
         initial = (
             initial if initial is not None else QtGui.QColor(255, 255, 255)
         )
 
         self._use_square_view = False
+        self._square_style = ColorSquareStyle.Hue
+        self._profiler: T.Optional[profiling.Profiler] = None
         self._initial = initial
         self._model = ColorModel(initial)
-        self._screen_color_picker = ScreenColorPicker(self._model, self)
+        self._scheduler = FrameScheduler(self)
+        self._thread_pool: T.Optional[QtCore.QThreadPool] = (
+            QtCore.QThreadPool.globalInstance()
+        )
+        self._screen_color_picker = ScreenColorPicker(
+            self._model, self, scheduler=self._scheduler
+        )
         self._options = (
             QtWidgets.QColorDialog.ColorDialogOptions() | self.ShowAlphaChannel
         )
-        self._alpha_grid = QtGui.QPixmap(
-            str(Path(__file__).parent / "grid.png")
-        )
+        self._alpha_grid = AlphaGrid(parent=self)
 
-        self._color_square = ColorSquare(self, self._model)
-        self._color_ring = ColorRing(self, self._model)
+        self._color_square: T.Optional["ColorSquare"] = None
+        self._color_ring: T.Optional["ColorRing"] = None
+        self._swatches: T.Optional["SwatchArea"] = None
         self._color_preview = ColorPreview(
-            self, initial, self._model, self._alpha_grid
+            self, initial, self._model, self._alpha_grid, self._scheduler
+        )
+        self._sliders = SlidersControl(
+            self, self._model, self._alpha_grid, self._scheduler
         )
-        self._sliders = SlidersControl(self, self._model, self._alpha_grid)
         self._strip = ButtonStrip(self)
 
-        left_layout = QtWidgets.QVBoxLayout()
+        self._left_layout = left_layout = QtWidgets.QVBoxLayout()
         left_layout.setSpacing(16)
         left_layout.setContentsMargins(0, 0, 16, 0)
-        left_layout.addWidget(self._color_square)
-        left_layout.addWidget(self._color_ring)
         left_layout.addWidget(self._color_preview)
 
         right_layout = QtWidgets.QVBoxLayout()
@@ -174,15 +221,11 @@ class QColorDialog(QtWidgets.QDialog):
         root_layout.addLayout(left_layout)
         root_layout.addLayout(right_layout)
 
-        self._sliders.radio_buttons[
-            self._color_square.square_style
-        ].setChecked(True)
+        self._sliders.radio_buttons[self._square_style].setChecked(True)
 
         for square_style, radio_button in self._sliders.radio_buttons.items():
             radio_button.clicked.connect(
-                functools.partial(
-                    self._color_square.set_square_style, square_style
-                )
+                functools.partial(self._set_square_style, square_style)
             )
         self._strip.accepted.connect(self.accept)
         self._strip.rejected.connect(self.reject)
@@ -190,9 +233,18 @@ class QColorDialog(QtWidgets.QDialog):
         self._strip.pick.connect(self._screen_color_picker.pick_screen_color)
         self._model.changed.connect(self._emit_signal)
 
+        if profiling.enabled_by_env():
+            profiling.enable()
+        self._sync_profiler()
+
         self.setWindowTitle("Select color")
         self.layout().setSizeConstraint(QtWidgets.QLayout.SetFixedSize)
-        self.show()
+        self._update_options()
+
+    def setVisible(self, visible: bool) -> None:
+        if visible:
+            self._update_view()
+        super().setVisible(visible)
 
     def options(self) -> QtWidgets.QColorDialog.ColorDialogOptions:
         return self._options
@@ -230,11 +282,79 @@ class QColorDialog(QtWidgets.QDialog):
         return self._model.color
 
     def alphaGrid(self) -> QtGui.QPixmap:
-        return self._alpha_grid
+        return self._alpha_grid.pixmap
 
     def setAlphaGrid(self, alpha_grid: QtGui.QPixmap) -> None:
-        self._alpha_grid.convertFromImage(alpha_grid.toImage())
-        self.update()
+        self._alpha_grid.set_pixmap(alpha_grid)
+
+    def colorNameIndex(self) -> T.Optional["ColorNameIndex"]:
+        return self._color_preview.name_index
+
+    def setColorNameIndex(
+        self, name_index: T.Optional["ColorNameIndex"]
+    ) -> None:
+        self._color_preview.set_name_index(name_index)
+
+    def swatchPalette(self) -> T.Optional["Palette"]:
+        if self._swatches is None:
+            return None
+        return self._swatches.swatch_palette
+
+    def setSwatchPalette(self, palette: T.Optional["Palette"]) -> None:
+        if self._swatches is None:
+            if palette is None:
+                return
+            from .swatches import SwatchArea
+
+            self._swatches = SwatchArea(self, self._model, self._alpha_grid)
+            self._left_layout.addWidget(self._swatches)
+        self._swatches.set_swatch_palette(palette)
+        self._swatches.setVisible(palette is not None)
+
+    def screenLoupeEnabled(self) -> bool:
+        return self._screen_color_picker.use_loupe
+
+    def setScreenLoupeEnabled(self, enabled: bool) -> None:
+        self._screen_color_picker.set_use_loupe(enabled)
+
+    def screenSampleSize(self) -> int:
+        return self._screen_color_picker.sample_size
+
+    def setScreenSampleSize(self, size: int) -> None:
+        self._screen_color_picker.set_sample_size(size)
+
+    def screenSampleMethod(self) -> "SampleMethod":
+        return self._screen_color_picker.sample_method
+
+    def setScreenSampleMethod(self, method: "SampleMethod") -> None:
+        self._screen_color_picker.set_sample_method(method)
+
+    def frameInterval(self) -> int:
+        return self._scheduler.interval
+
+    def setFrameInterval(self, interval: int) -> None:
+        self._scheduler.set_interval(interval)
+
+    def threadedRendering(self) -> bool:
+        return self._thread_pool is not None
+
+    def setThreadedRendering(self, enabled: bool) -> None:
+        self._thread_pool = (
+            QtCore.QThreadPool.globalInstance() if enabled else None
+        )
+        for view in [self._color_square, self._color_ring]:
+            if view is not None:
+                view.set_thread_pool(self._thread_pool)
+
+    def setProfilingEnabled(self, enabled: bool) -> None:
+        if enabled:
+            self._watch_profiler(profiling.enable())
+        else:
+            profiling.disable()
+
+    def profilingStats(self) -> T.Dict[str, T.Any]:
+        profiler = profiling.active_profiler()
+        return profiler.stats() if profiler is not None else {}
 
     def useSquareView(self) -> bool:
         return self._use_square_view
@@ -243,6 +363,46 @@ class QColorDialog(QtWidgets.QDialog):
         self._use_square_view = use_square_view
         self._update_options()
 
+    @classmethod
+    def poolSize(cls) -> int:
+        return cls._pool_size
+
+    @classmethod
+    def setPoolSize(cls, size: int) -> None:
+        cls._pool_size = max(0, size)
+        while len(cls._pool) > cls._pool_size:
+            cls._pool.pop().deleteLater()
+
+    @classmethod
+    def releasePool(cls) -> None:
+        while cls._pool:
+            cls._pool.pop().deleteLater()
+
+    @classmethod
+    def _acquire(
+        cls,
+        initial: T.Optional[QtGui.QColor],
+        parent: T.Optional[QtWidgets.QWidget],
+    ) -> "QColorDialog":
+        while cls._pool:
+            dialog = cls._pool.pop()
+            if not sip.isdeleted(dialog):
+                break
+        else:
+            return cls(initial, parent)
+        dialog.setParent(parent, dialog.windowFlags())
+        dialog._restore_defaults(initial)
+        return dialog
+
+    @classmethod
+    def _release(cls, dialog: "QColorDialog") -> None:
+        if len(cls._pool) < cls._pool_size:
+            dialog.hide()
+            dialog.setParent(None, dialog.windowFlags())
+            cls._pool.append(dialog)
+        elif cls._pool_size:
+            dialog.deleteLater()
+
     @staticmethod
     def getColor(
         initial: T.Optional[QtGui.QColor] = None,
@@ -252,28 +412,108 @@ class QColorDialog(QtWidgets.QDialog):
         use_square_view: T.Optional[bool] = False,
         alpha_grid: T.Optional[QtGui.QPixmap] = None,
     ) -> QtGui.QColor:
-        dialog = QColorDialog(initial, parent)
-        if title is not None:
-            dialog.setWindowTitle(title)
-        if options is not None:
-            dialog.setOptions(options)
-        if alpha_grid is not None:
-            dialog.setAlphaGrid(alpha_grid)
-        if use_square_view is not None:
-            dialog.setUseSquareView(use_square_view)
-        ret = dialog.exec_()
-        if ret == QtWidgets.QDialog.Accepted:
-            return dialog.selectedColor()
-        return QtGui.QColor()
+        dialog = QColorDialog._acquire(initial, parent)
+        try:
+            if title is not None:
+                dialog.setWindowTitle(title)
+            if options is not None:
+                dialog.setOptions(options)
+            if alpha_grid is not None:
+                dialog.setAlphaGrid(alpha_grid)
+            if use_square_view is not None:
+                dialog.setUseSquareView(use_square_view)
+            ret = dialog.exec_()
+            if ret == QtWidgets.QDialog.Accepted:
+                return dialog.selectedColor()
+            return QtGui.QColor()
+        finally:
+            QColorDialog._release(dialog)
+
+    def _restore_defaults(self, initial: T.Optional[QtGui.QColor]) -> None:
+        from .color_square import ColorSquareStyle
+        from .screen_color_picker import SampleMethod
+
+        self._initial = (
+            initial if initial is not None else QtGui.QColor(255, 255, 255)
+        )
+        self._scheduler.flush()
+        self._model.color = self._initial
+        self._color_preview.set_orig_color(self._initial)
+        self._alpha_grid.set_pixmap(default_alpha_grid())
+        self._color_preview.set_name_index(None)
+        self.setSwatchPalette(None)
+        self.setScreenLoupeEnabled(True)
+        self.setScreenSampleSize(1)
+        self.setScreenSampleMethod(SampleMethod.Mean)
+        self.setThreadedRendering(True)
+        self.setFrameInterval(DEFAULT_INTERVAL)
+        self._sync_profiler()
+        self._sliders.radio_buttons[ColorSquareStyle.Hue].setChecked(True)
+        self._set_square_style(ColorSquareStyle.Hue)
+        self._options = (
+            QtWidgets.QColorDialog.ColorDialogOptions() | self.ShowAlphaChannel
+        )
+        self._use_square_view = False
+        self.setWindowTitle("Select color")
+        self._update_options()
+
+    def _get_view(self) -> QtWidgets.QWidget:
+        if self._use_square_view:
+            if self._color_square is None:
+                from .color_square import ColorSquare
+
+                self._color_square = ColorSquare(
+                    self,
+                    self._model,
+                    self._square_style,
+                    self._scheduler,
+                    self._thread_pool,
+                )
+                self._left_layout.insertWidget(0, self._color_square)
+            return self._color_square
+        if self._color_ring is None:
+            from .color_ring import ColorRing
+
+            self._color_ring = ColorRing(
+                self, self._model, self._scheduler, self._thread_pool
+            )
+            self._left_layout.insertWidget(0, self._color_ring)
+        return self._color_ring
+
+    def _set_square_style(self, square_style: "ColorSquareStyle") -> None:
+        self._square_style = square_style
+        if self._color_square is not None:
+            self._color_square.set_square_style(square_style)
 
     def _update_options(self) -> None:
-        for widget in self._sliders.alpha_widgets:
-            widget.setVisible(self._options & self.ShowAlphaChannel)
-        self._color_square.setVisible(self._use_square_view)
-        self._color_ring.setVisible(not self._use_square_view)
+        self._strip.setVisible(not self._options & self.NoButtons)
+        if self.isVisible():
+            self._update_view()
+
+    def _update_view(self) -> None:
+        self._sliders.set_alpha_visible(
+            bool(self._options & self.ShowAlphaChannel)
+        )
+        view = self._get_view()
+        for widget in [self._color_square, self._color_ring]:
+            if widget is not None:
+                widget.setVisible(widget is view)
         for widget in self._sliders.radio_buttons.values():
             widget.setVisible(self._use_square_view)
-        self._strip.setVisible(not self._options & self.NoButtons)
+
+    def _sync_profiler(self) -> None:
+        profiler = profiling.active_profiler()
+        if profiler is None:
+            self._profiler = None
+        else:
+            self._watch_profiler(profiler)
+
+    def _watch_profiler(self, profiler: profiling.Profiler) -> None:
+        if profiler is self._profiler:
+            return
+        self._profiler = profiler
+        profiler.watch_model(self._model, f"ColorModel@{id(self._model):x}")
+        profiler.watch_window(self)
 
     def _emit_signal(self) -> None:
         self.colorSelected.emit(self.selectedColor())
@@ -1,151 +1,242 @@
+import contextlib
 import math
 import typing as T
 
 from PyQt5 import QtCore, QtGui
 
+from .util import clamp
+
+
+def hsv_to_rgb(h: float, s: float, v: float) -> T.Tuple[float, float, float]:
+    if s == 0.0:
+        return (v, v, v)
+    h = (h % 1.0) * 6
+    i = min(int(h), 5)
+    f = h - i
+    p = v * (1 - s)
+    if i & 1:
+        q = v * (1 - s * f)
+        if i == 1:
+            return (q, v, p)
+        if i == 3:
+            return (p, q, v)
+        return (v, p, q)
+    t = v * (1 - s * (1 - f))
+    if i == 0:
+        return (v, t, p)
+    if i == 2:
+        return (p, v, t)
+    return (t, p, v)
+
+
+def rgb_to_hsv(r: float, g: float, b: float) -> T.Tuple[float, float, float]:
+    max_c = max(r, g, b)
+    min_c = min(r, g, b)
+    delta = max_c - min_c
+    if max_c == 0.0 or delta == 0.0:
+        return (0.0, 0.0, max_c)
+    if r == max_c:
+        h = (g - b) / delta
+    elif g == max_c:
+        h = 2 + (b - r) / delta
+    else:
+        h = 4 + (r - g) / delta
+    return ((h / 6) % 1.0, delta / max_c, max_c)
+
+
+class ColorValue:
+    __slots__ = ("h", "s", "v", "r", "g", "b", "a")
+
+    def __init__(self, r: float, g: float, b: float, a: float = 1.0) -> None:
+        self.r = r
+        self.g = g
+        self.b = b
+        self.a = a
+        self.h, self.s, self.v = rgb_to_hsv(r, g, b)
+
+    def set_hsv(self, h: float, s: float, v: float) -> None:
+        self.h = h
+        self.s = s
+        self.v = v
+        self.r, self.g, self.b = hsv_to_rgb(h, s, v)
+
+    def set_rgb(self, r: float, g: float, b: float) -> None:
+        self.r = r
+        self.g = g
+        self.b = b
+        self.h, self.s, self.v = rgb_to_hsv(r, g, b)
+
+    def to_qcolor(self) -> QtGui.QColor:
+        return QtGui.QColor.fromRgbF(self.r, self.g, self.b, self.a)
+
 
 class ColorModel(QtCore.QObject):
     changed = QtCore.pyqtSignal()
 
     def __init__(self, color: QtGui.QColor) -> None:
         super().__init__()
-        self._h: float = color.hueF()
-        self._s: float = color.saturationF()
-        self._v: float = color.valueF()
-        self._r: float = color.redF()
-        self._g: float = color.greenF()
-        self._b: float = color.blueF()
-        self._a: float = color.alphaF()
-        self._syncing = False
-        self._color = QtGui.QColor(color)
+        self._value = ColorValue(
+            color.redF(), color.greenF(), color.blueF(), color.alphaF()
+        )
+        self._batch_depth = 0
+        self._batch_changed = False
+        self._changed_count = 0
+        self._color: T.Optional[QtGui.QColor] = QtGui.QColor(color)
 
     @property
     def color(self) -> QtGui.QColor:
+        if self._color is None:
+            self._color = self._value.to_qcolor()
         return self._color
 
     @color.setter
     def color(self, color: QtGui.QColor) -> None:
-        self._r = color.redF()
-        self._g = color.greenF()
-        self._b = color.blueF()
-        self._sync_to_hsv()
-        self.a = color.alphaF()
-
-    def _sync_to_rgb(self) -> None:
-        if self._syncing:
-            return
-        self._syncing = True
-        self._color = QtGui.QColor.fromHsvF(self.h, self.s, self.v, self.a)
-        self.r = self._color.redF()
-        self.g = self._color.greenF()
-        self.b = self._color.blueF()
-        self._syncing = False
-
-    def _sync_to_hsv(self) -> None:
-        if self._syncing:
-            return
-        self._syncing = True
-        self._color = QtGui.QColor.fromRgbF(self.r, self.g, self.b, self.a)
-        self.h = self._color.hueF()
-        self.s = self._color.saturationF()
-        self.v = self._color.valueF()
-        self._syncing = False
+        self.set_rgba(
+            color.redF(), color.greenF(), color.blueF(), color.alphaF()
+        )
+
+    @property
+    def changed_count(self) -> int:
+        return self._changed_count
+
+    @contextlib.contextmanager
+    def batch(self) -> T.Iterator[None]:
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_changed:
+                self._batch_changed = False
+                self._emit()
+
+    def set_hsva(
+        self, h: float, s: float, v: float, a: T.Optional[float] = None
+    ) -> None:
+        value = self._value
+        h = clamp(h, 0.0, 1.0)
+        s = clamp(s, 0.0, 1.0)
+        v = clamp(v, 0.0, 1.0)
+        a = value.a if a is None else clamp(a, 0.0, 1.0)
+        if (h, s, v, a) != (value.h, value.s, value.v, value.a):
+            value.set_hsv(h, s, v)
+            value.a = a
+            self._emit_changed()
+
+    def set_rgba(
+        self, r: float, g: float, b: float, a: T.Optional[float] = None
+    ) -> None:
+        value = self._value
+        r = clamp(r, 0.0, 1.0)
+        g = clamp(g, 0.0, 1.0)
+        b = clamp(b, 0.0, 1.0)
+        a = value.a if a is None else clamp(a, 0.0, 1.0)
+        if (r, g, b, a) != (value.r, value.g, value.b, value.a):
+            value.set_rgb(r, g, b)
+            value.a = a
+            self._emit_changed()
+
+    def _emit_changed(self) -> None:
+        self._color = None
+        if self._batch_depth:
+            self._batch_changed = True
+        else:
+            self._emit()
+
+    def _emit(self) -> None:
+        self._changed_count += 1
+        self.changed.emit()
 
     @property
     def a(self) -> float:
-        return self._a
+        return self._value.a
 
     @a.setter
     def a(self, a: float) -> None:
-        a = max(0.0, min(1.0, a))
-        if a != self._a:
-            self._a = a
-            self.changed.emit()
-            self._color.setAlphaF(a)
+        a = clamp(a, 0.0, 1.0)
+        if a != self._value.a:
+            self._value.a = a
+            self._emit_changed()
 
     @property
     def h(self) -> float:
-        return self._h
+        return self._value.h
 
     @h.setter
     def h(self, h: float) -> None:
-        h = max(0.0, min(1.0, h))
-        if h != self._h:
-            self._h = h
-            self._sync_to_rgb()
-            self.changed.emit()
+        value = self._value
+        self.set_hsva(h, value.s, value.v)
 
     @property
     def s(self) -> float:
-        return self._s
+        return self._value.s
 
     @s.setter
     def s(self, s: float) -> None:
-        s = max(0.0, min(1.0, s))
-        if s != self._s:
-            self._s = s
-            self._sync_to_rgb()
-            self.changed.emit()
+        value = self._value
+        self.set_hsva(value.h, s, value.v)
 
     @property
     def v(self) -> float:
-        return self._v
+        return self._value.v
 
     @v.setter
     def v(self, v: float) -> None:
-        v = max(0.0, min(1.0, v))
-        if v != self._v:
-            self._v = v
-            self._sync_to_rgb()
-            self.changed.emit()
+        value = self._value
+        self.set_hsva(value.h, value.s, v)
 
     @property
     def r(self) -> float:
-        return self._r
+        return self._value.r
 
     @r.setter
     def r(self, r: float) -> None:
-        r = max(0.0, min(1.0, r))
-        if r != self._r:
-            self._r = r
-            self._sync_to_hsv()
-            self.changed.emit()
+        value = self._value
+        self.set_rgba(r, value.g, value.b)
 
     @property
     def g(self) -> float:
-        return self._g
+        return self._value.g
 
     @g.setter
     def g(self, g: float) -> None:
-        g = max(0.0, min(1.0, g))
-        if g != self._g:
-            self._g = g
-            self._sync_to_hsv()
-            self.changed.emit()
+        value = self._value
+        self.set_rgba(value.r, g, value.b)
 
     @property
     def b(self) -> float:
-        return self._b
+        return self._value.b
 
     @b.setter
     def b(self, b: float) -> None:
-        b = max(0.0, min(1.0, b))
-        if b != self._b:
-            self._b = b
-            self._sync_to_hsv()
-            self.changed.emit()
+        value = self._value
+        self.set_rgba(value.r, value.g, b)
+
+
+def _linearize(c: float) -> float:
+    if c <= 0.03928:
+        return c / 12.92
+    return ((c + 0.055) / 1.055) ** 2.4
+
+
+LINEAR_LUT_SIZE = 255 * 16 + 1
+LINEAR_LUT = [
+    _linearize(i / (LINEAR_LUT_SIZE - 1)) for i in range(LINEAR_LUT_SIZE)
+]
+BLACK_THRESHOLD = math.sqrt(1.05 * 0.05) - 0.05
+
+
+def relative_luminance(r: float, g: float, b: float) -> float:
+    scale = LINEAR_LUT_SIZE - 1
+    return (
+        0.2126 * LINEAR_LUT[int(r * scale + 0.5)]
+        + 0.7152 * LINEAR_LUT[int(g * scale + 0.5)]
+        + 0.0722 * LINEAR_LUT[int(b * scale + 0.5)]
+    )
 
 
 def black_or_white(color: QtGui.QColor) -> int:
-    rgb: T.List[float] = []
-    for c in [color.redF(), color.greenF(), color.blueF()]:
-        if c <= 0.03928:
-            c = c / 12.92
-        else:
-            c = ((c + 0.055) / 1.055) ** 2.4
-        rgb.append(c)
-    r, g, b = rgb
-    luminance = 0.2126 * r + 0.7152 * g + 0.0722 * b
-    if luminance > math.sqrt(1.05 * 0.05) - 0.05:
+    luminance = relative_luminance(color.redF(), color.greenF(), color.blueF())
+    if luminance > BLACK_THRESHOLD:
         return QtCore.Qt.black
     return QtCore.Qt.white
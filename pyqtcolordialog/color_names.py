@@ -0,0 +1,134 @@
+import functools
+import typing as T
+
+import numpy as np
+from PyQt5 import QtGui
+
+from .color_arrays import to_oklab
+
+
+class ColorNameIndex:
+    _leaf_size = 32
+
+    def __init__(self, names: T.Sequence[str], colors: np.ndarray) -> None:
+        colors = np.asarray(colors, np.float64)
+        if colors.ndim != 2 or colors.shape[1] not in (3, 4):
+            raise ValueError("expected an N x 3 or N x 4 color array")
+        if len(names) != len(colors):
+            raise ValueError("names and colors differ in length")
+        if not len(names):
+            raise ValueError("cannot index an empty palette")
+
+        self._names = list(names)
+        self._colors = colors[:, :3]
+
+        points = to_oklab(self._colors)
+        order = np.arange(len(points))
+        self._split_dim: T.List[int] = []
+        self._split_value: T.List[float] = []
+        self._children: T.List[T.Tuple[int, int]] = []
+        self._ranges: T.List[T.Tuple[int, int]] = []
+        self._bounds: T.List[T.Tuple[T.List[float], T.List[float]]] = []
+
+        stack = [self._add_node(0, len(points))]
+        while stack:
+            node = stack.pop()
+            start, end = self._ranges[node]
+            segment = order[start:end]
+            segment_points = points[segment]
+            low = segment_points.min(axis=0)
+            high = segment_points.max(axis=0)
+            self._bounds[node] = (low.tolist(), high.tolist())
+            if end - start <= self._leaf_size:
+                continue
+            dim = int((high - low).argmax())
+            mid = (end - start) // 2
+            segment = segment[
+                np.argpartition(
+                    segment_points[:, dim], mid, kind="introselect"
+                )
+            ]
+            order[start:end] = segment
+            self._split_dim[node] = dim
+            self._split_value[node] = float(points[segment[mid], dim])
+            self._children[node] = (
+                self._add_node(start, start + mid),
+                self._add_node(start + mid, end),
+            )
+            stack.extend(self._children[node])
+
+        self._order = order
+        self._points = points[order]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def names(self) -> T.List[str]:
+        return self._names
+
+    def name(self, index: int) -> str:
+        return self._names[index]
+
+    def color(self, index: int) -> QtGui.QColor:
+        return QtGui.QColor.fromRgbF(*self._colors[index])
+
+    def nearest(self, color: QtGui.QColor) -> int:
+        return self.nearest_rgb(color.redF(), color.greenF(), color.blueF())
+
+    def nearest_rgb(self, r: float, g: float, b: float) -> int:
+        point = to_oklab(np.array([r, g, b]))
+        coords = point.tolist()
+        best = -1
+        best_distance = float("inf")
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_distance:
+                continue
+            dim = self._split_dim[node]
+            if dim < 0:
+                start, end = self._ranges[node]
+                distances = ((self._points[start:end] - point) ** 2).sum(
+                    axis=1
+                )
+                i = int(distances.argmin())
+                if distances[i] < best_distance:
+                    best_distance = float(distances[i])
+                    best = start + i
+                continue
+            left, right = self._children[node]
+            if coords[dim] < self._split_value[node]:
+                near, far = left, right
+            else:
+                near, far = right, left
+            stack.append((far, self._box_distance(far, coords)))
+            stack.append((near, self._box_distance(near, coords)))
+        return int(self._order[best])
+
+    def _box_distance(self, node: int, coords: T.List[float]) -> float:
+        low, high = self._bounds[node]
+        distance = 0.0
+        for c, lo, hi in zip(coords, low, high):
+            if c < lo:
+                distance += (lo - c) ** 2
+            elif c > hi:
+                distance += (c - hi) ** 2
+        return distance
+
+    def _add_node(self, start: int, end: int) -> int:
+        self._split_dim.append(-1)
+        self._split_value.append(0.0)
+        self._children.append((-1, -1))
+        self._ranges.append((start, end))
+        self._bounds.append(([], []))
+        return len(self._ranges) - 1
+
+
+@functools.lru_cache(maxsize=None)
+def css_color_names() -> ColorNameIndex:
+    names = QtGui.QColor.colorNames()
+    colors = np.array(
+        [QtGui.QColor(name).getRgbF()[:3] for name in names], np.float64
+    )
+    return ColorNameIndex(names, colors)
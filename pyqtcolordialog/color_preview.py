@@ -2,7 +2,13 @@ import typing as T
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from .alpha_grid import AlphaGrid
 from .color_model import ColorModel, black_or_white
+from .profiling import profile_paint
+from .scheduler import FrameScheduler, schedule_update
+
+if T.TYPE_CHECKING:
+    from .color_names import ColorNameIndex
 
 
 class ColorPreview(QtWidgets.QFrame):
@@ -11,47 +17,94 @@ class ColorPreview(QtWidgets.QFrame):
         parent: QtWidgets.QWidget,
         orig_color: QtGui.QColor,
         model: ColorModel,
-        alpha_grid: QtGui.QPixmap,
+        alpha_grid: AlphaGrid,
+        scheduler: T.Optional[FrameScheduler] = None,
     ) -> None:
         super().__init__(parent)
         self._orig_color = orig_color
         self._model = model
         self._alpha_grid = alpha_grid
+        self._alpha_grid.changed.connect(self.update)
 
-        self._model.changed.connect(self.update)
+        self._scheduler = scheduler
+        self._name_index: T.Optional["ColorNameIndex"] = None
+        self._names: T.Dict[int, str] = {}
+        self._model.changed.connect(self._model_changed)
 
         self.setFrameStyle(QtWidgets.QFrame.Panel | QtWidgets.QFrame.Sunken)
 
     def sizeHint(self) -> T.Tuple[int, int]:
         return QtCore.QSize(300, 50)
 
+    @profile_paint
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
         rect = self.rect()
         rect -= QtCore.QMargins(*[self.lineWidth()] * 4)
-
-        left = QtCore.QRect(rect)
-        left.setWidth(left.width() // 2)
-        right = QtCore.QRect(rect)
-        right.setLeft(left.width())
+        left, right = self._get_halves()
 
         painter = QtGui.QPainter()
         painter.begin(self)
-        painter.drawTiledPixmap(rect, self._alpha_grid)
-        self._draw_color(painter, left, self._orig_color)
-        self._draw_color(painter, right, self._model.color)
+        painter.drawPixmap(
+            rect.topLeft(),
+            self._alpha_grid.tiled(rect.size(), self.devicePixelRatioF()),
+        )
+        if event.rect().intersects(left):
+            self._draw_color(painter, left, self._orig_color)
+        if event.rect().intersects(right):
+            self._draw_color(painter, right, self._model.color)
         painter.end()
 
         super().paintEvent(event)
 
+    def _model_changed(self) -> None:
+        schedule_update(self._scheduler, self, self._get_halves()[1])
+
+    def _get_halves(self) -> T.Tuple[QtCore.QRect, QtCore.QRect]:
+        rect = self.rect()
+        rect -= QtCore.QMargins(*[self.lineWidth()] * 4)
+
+        left = QtCore.QRect(rect)
+        left.setWidth(left.width() // 2)
+        right = QtCore.QRect(rect)
+        right.setLeft(left.width())
+        return (left, right)
+
     def _draw_color(
         self, painter: QtGui.QPainter, rect: QtCore.QRect, color: QtGui.QColor
     ) -> None:
         text = f"#{color.red():02X}{color.green():02X}{color.blue():02X}"
+        if self._name_index is not None:
+            text += "\n" + self._get_name(color)
         painter.fillRect(rect, color)
 
         painter.setPen(black_or_white(color))
         painter.drawText(rect, QtCore.Qt.AlignCenter, text)
 
+    @property
+    def name_index(self) -> T.Optional["ColorNameIndex"]:
+        return self._name_index
+
+    def set_name_index(self, name_index: T.Optional["ColorNameIndex"]) -> None:
+        if name_index is self._name_index:
+            return
+        self._name_index = name_index
+        self._names.clear()
+        self.update()
+
+    def _get_name(self, color: QtGui.QColor) -> str:
+        key = color.rgb()
+        name = self._names.get(key)
+        if name is None:
+            if len(self._names) > 64:
+                self._names.clear()
+            name = self._name_index.name(self._name_index.nearest(color))
+            self._names[key] = name
+        return name
+
+    def set_orig_color(self, color: QtGui.QColor) -> None:
+        self._orig_color = color
+        self.update()
+
     def set_color(self, color: QtGui.QColor) -> None:
         self._color = color
         self.update()
@@ -1,65 +1,333 @@
+import functools
 import math
 import sys
 import typing as T
 
+import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-from .color_model import ColorModel, black_or_white
-from .geometry import point_in_ring, point_in_triangle
-from .util import blend, clamp, is_imprecise_click, is_precise_click
+from .color_model import ColorModel, black_or_white, hsv_to_rgb
+from .geometry import Triangle
+from .profiling import profile_paint
+from .raster import image_from_array, pixel_centers, to_rgba8
+from .scheduler import FrameScheduler, schedule, schedule_update, unschedule
+from .threaded_render import ThreadedRenderer
+from .util import is_imprecise_click, is_precise_click
+
+_TRIANGLE_HUE_STEPS = 3600
+
+
+@functools.lru_cache(maxsize=8)
+def _render_triangle(
+    hue_step: int, side: int, height: int, device_pixel_ratio: float
+) -> QtGui.QImage:
+    hue_rgb = np.array(
+        hsv_to_rgb(hue_step / _TRIANGLE_HUE_STEPS, 1, 1), np.float32
+    )
+
+    x, y = pixel_centers(
+        int(math.ceil(side * device_pixel_ratio)),
+        int(math.ceil(height * device_pixel_ratio)),
+        device_pixel_ratio,
+    )
+
+    y_ratio = np.clip(y / height, 0, 1)
+    x1 = (1 - y_ratio) / 2
+    x2 = 1 - x1
+    x_ratio = np.clip(
+        ((x / side) - x1) / np.maximum(sys.float_info.min, x2 - x1), 0, 1
+    )
+    rgb = (1 - y_ratio)[..., None] * hue_rgb + (x_ratio * y_ratio)[..., None]
+
+    half_side = side / 2
+    edge = math.hypot(half_side, height)
+    inside = np.minimum(
+        np.minimum(
+            (height * x - half_side * (height - y)) / edge,
+            (half_side * y - height * (x - half_side)) / edge,
+        ),
+        height - y,
+    )
+    alpha = np.clip(inside * device_pixel_ratio + 0.5, 0, 1)
+
+    return image_from_array(to_rgba8(rgb, alpha), device_pixel_ratio)
+
+
+def render_triangle(
+    hue: float, side: int, height: int, device_pixel_ratio: float = 1.0
+) -> QtGui.QImage:
+    return _render_triangle(
+        _hue_step(hue), side, height, device_pixel_ratio
+    ).copy()
+
+
+def _hue_step(hue: float) -> int:
+    return round(hue * _TRIANGLE_HUE_STEPS) % _TRIANGLE_HUE_STEPS
+
+
+@functools.lru_cache(maxsize=8)
+def _render_hue_ring(
+    diameter: int, ring_width: int, device_pixel_ratio: float
+) -> QtGui.QImage:
+    radius = diameter / 2
+    gradient = QtGui.QConicalGradient(QtCore.QPointF(radius, radius), 0.0)
+    gradient.setColorAt(0 / 6, QtGui.QColor(255, 0, 0, 255))
+    gradient.setColorAt(1 / 6, QtGui.QColor(255, 0, 255, 255))
+    gradient.setColorAt(2 / 6, QtGui.QColor(0, 0, 255, 255))
+    gradient.setColorAt(3 / 6, QtGui.QColor(0, 255, 255, 255))
+    gradient.setColorAt(4 / 6, QtGui.QColor(0, 255, 0, 255))
+    gradient.setColorAt(5 / 6, QtGui.QColor(255, 255, 0, 255))
+    gradient.setColorAt(6 / 6, QtGui.QColor(255, 0, 0, 255))
+
+    image = QtGui.QImage(
+        int(diameter * device_pixel_ratio),
+        int(diameter * device_pixel_ratio),
+        QtGui.QImage.Format_ARGB32_Premultiplied,
+    )
+    image.setDevicePixelRatio(device_pixel_ratio)
+    image.fill(0)
+
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+    painter.setPen(QtCore.Qt.NoPen)
+    painter.setBrush(QtCore.Qt.white)
+    painter.drawEllipse(0, 0, diameter, diameter)
+
+    painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+    painter.setBrush(QtCore.Qt.transparent)
+    painter.drawEllipse(
+        ring_width,
+        ring_width,
+        diameter - ring_width * 2,
+        diameter - ring_width * 2,
+    )
+
+    painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceAtop)
+    painter.setBrush(QtGui.QBrush(gradient))
+    painter.drawRect(0, 0, diameter, diameter)
+    painter.end()
+
+    return image
+
+
+def render_hue_ring(
+    diameter: int, ring_width: int, device_pixel_ratio: float = 1.0
+) -> QtGui.QImage:
+    return _render_hue_ring(diameter, ring_width, device_pixel_ratio).copy()
+
+
+def render_color_ring(
+    hue: float,
+    diameter: int,
+    ring_width: int,
+    device_pixel_ratio: float = 1.0,
+) -> QtGui.QImage:
+    image = _render_hue_ring(diameter, ring_width, device_pixel_ratio).copy()
+    painter = QtGui.QPainter(image)
+    painter.drawImage(
+        0,
+        0,
+        _render_triangle_layer(
+            _hue_step(hue), diameter, ring_width, device_pixel_ratio
+        ),
+    )
+    painter.end()
+    return image
+
+
+def _render_triangle_layer(
+    hue_step: int, diameter: int, ring_width: int, device_pixel_ratio: float
+) -> QtGui.QImage:
+    side, height = _triangle_size(diameter // 2 - ring_width)
+    geometry = _TriangleGeometry(
+        hue_step / _TRIANGLE_HUE_STEPS, diameter // 2, side, height
+    )
+
+    image = QtGui.QImage(
+        int(diameter * device_pixel_ratio),
+        int(diameter * device_pixel_ratio),
+        QtGui.QImage.Format_ARGB32_Premultiplied,
+    )
+    image.setDevicePixelRatio(device_pixel_ratio)
+    image.fill(0)
+
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+    painter.setTransform(geometry.transform)
+    painter.drawImage(
+        0, 0, _render_triangle(hue_step, side, height, device_pixel_ratio)
+    )
+    painter.end()
+
+    return image
+
+
+def _triangle_size(inner_radius: int) -> T.Tuple[int, int]:
+    return (int(inner_radius * 3 / math.sqrt(3)), int(inner_radius * 3 / 2))
+
+
+class _TriangleGeometry:
+    __slots__ = (
+        "transform",
+        "_cos",
+        "_sin",
+        "_origin",
+        "_offset_x",
+        "_offset_y",
+        "_side",
+        "_height",
+        "_triangle",
+    )
+
+    def __init__(
+        self, hue: float, origin: int, side: int, height: int
+    ) -> None:
+        self.transform = QtGui.QTransform()
+        self.transform.translate(origin, origin)
+        self.transform.rotate(hue * 360.0)
+        self.transform.rotate(90.0)
+        self.transform.translate(-side / 2, -height * 2 / 3)
+
+        angle = math.radians(hue * 360.0 + 90.0)
+        self._cos = math.cos(angle)
+        self._sin = math.sin(angle)
+        self._origin = origin
+        self._offset_x = side / 2
+        self._offset_y = height * 2 / 3
+        self._side = side
+        self._height = height
+        self._triangle = Triangle((side // 2, 0), (0, height), (side, height))
+
+    def map_to_triangle(self, x: float, y: float) -> T.Tuple[float, float]:
+        x -= self._origin
+        y -= self._origin
+        return (
+            x * self._cos + y * self._sin + self._offset_x,
+            y * self._cos - x * self._sin + self._offset_y,
+        )
+
+    def contains(self, x: float, y: float) -> bool:
+        return self._triangle.contains(*self.map_to_triangle(x, y))
+
+    def saturation_and_value(
+        self, x: float, y: float
+    ) -> T.Tuple[float, float]:
+        x, y = self.map_to_triangle(x, y)
+        y_ratio = min(1.0, max(0.0, y / self._height))
+        x1 = (1 - y_ratio) / 2
+        x_ratio = (x / self._side - x1) / max(sys.float_info.min, 1 - 2 * x1)
+        x_ratio = min(1.0, max(0.0, x_ratio))
+        white = x_ratio * y_ratio
+        value = 1 - y_ratio + white
+        if value <= 0.0:
+            return (0.0, 0.0)
+        return ((1 - y_ratio) / value, value)
 
 
 class ColorRing(QtWidgets.QWidget):
     _ring_outer_radius = 150
     _ring_width = 35
 
-    def __init__(self, parent: QtWidgets.QWidget, model: ColorModel) -> None:
+    def __init__(
+        self,
+        parent: QtWidgets.QWidget,
+        model: ColorModel,
+        scheduler: T.Optional[FrameScheduler] = None,
+        thread_pool: T.Optional[QtCore.QThreadPool] = None,
+    ) -> None:
         super().__init__(parent)
         self._model = model
-        self._model.changed.connect(self.update)
+        self._scheduler = scheduler
+        self._model.changed.connect(self._model_changed)
+        self._renderer = ThreadedRenderer(
+            _render_triangle_layer, thread_pool, self
+        )
+        self._renderer.ready.connect(self.update)
 
         self._pressed_control: T.Optional[str] = None
-        self._ring_gradient = QtGui.QConicalGradient(
-            QtCore.QPoint(self._ring_outer_radius, self._ring_outer_radius),
-            0.0,
+        self._painted_hue: T.Optional[float] = None
+        self._triangle_hue: T.Optional[float] = None
+        self._painted_marker: T.Optional[QtCore.QRect] = None
+        self._triangle_geometry: T.Optional[_TriangleGeometry] = None
+        self._triangle_geometry_key: T.Optional[T.Tuple[float, int, int]] = (
+            None
         )
-        self._ring_gradient.setColorAt(0 / 6, QtGui.QColor(255, 0, 0, 255))
-        self._ring_gradient.setColorAt(1 / 6, QtGui.QColor(255, 0, 255, 255))
-        self._ring_gradient.setColorAt(2 / 6, QtGui.QColor(0, 0, 255, 255))
-        self._ring_gradient.setColorAt(3 / 6, QtGui.QColor(0, 255, 255, 255))
-        self._ring_gradient.setColorAt(4 / 6, QtGui.QColor(0, 255, 0, 255))
-        self._ring_gradient.setColorAt(5 / 6, QtGui.QColor(255, 255, 0, 255))
-        self._ring_gradient.setColorAt(6 / 6, QtGui.QColor(255, 0, 0, 255))
+        self._pending_x = 0
+        self._pending_y = 0
 
         self.setFixedSize(self._ring_outer_diameter, self._ring_outer_diameter)
         self.setSizePolicy(
             QtWidgets.QSizePolicy.Maximum, QtWidgets.QSizePolicy.Maximum
         )
 
+    @property
+    def thread_pool(self) -> T.Optional[QtCore.QThreadPool]:
+        return self._renderer.thread_pool
+
+    def set_thread_pool(
+        self, thread_pool: T.Optional[QtCore.QThreadPool]
+    ) -> None:
+        self._renderer.set_thread_pool(thread_pool)
+
+    @profile_paint
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        device_pixel_ratio = self.devicePixelRatioF()
+        triangle = self._renderer.image(
+            (
+                _hue_step(self._model.h),
+                self._ring_outer_diameter,
+                self._ring_width,
+                device_pixel_ratio,
+            )
+        )
+        triangle_hue = self._renderer.key[0] / _TRIANGLE_HUE_STEPS
+
         painter = QtGui.QPainter(self)
-        painter.drawImage(0, 0, self._draw_ring())
-        painter.drawImage(0, 0, self._draw_triangle())
+        painter.drawImage(
+            0,
+            0,
+            _render_hue_ring(
+                self._ring_outer_diameter, self._ring_width, device_pixel_ratio
+            ),
+        )
+        painter.drawImage(0, 0, triangle)
+        self._draw_hue_marker(painter)
+        self._draw_triangle_marker(painter, triangle_hue)
+        painter.end()
+
+        self._painted_hue = self._model.h
+        self._triangle_hue = triangle_hue
+        self._painted_marker = self._get_triangle_marker_rect(triangle_hue)
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        self._invalidate()
+        super().resizeEvent(event)
 
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
         is_precise = is_precise_click(event.button(), self.style())
         is_imprecise = is_imprecise_click(event.button(), self.style())
 
         if is_precise or is_imprecise:
-            if point_in_ring(
-                event.pos() - self.rect().center(),
-                self._ring_inner_radius,
-                self._ring_outer_radius,
+            x = event.x()
+            y = event.y()
+            dx = x - (self.width() - 1) // 2
+            dy = y - (self.height() - 1) // 2
+            if (
+                self._ring_inner_radius**2
+                <= dx * dx + dy * dy
+                <= self._ring_outer_radius**2
             ):
                 event.accept()
-                self._sync_hue_from_ring(event.pos())
+                self._sync_hue_from_ring(x, y)
                 if is_imprecise:
                     self._pressed_control = "ring"
                 return
 
-            if point_in_triangle(event.pos(), self._get_triangle_points()):
+            if self._get_triangle_geometry().contains(x, y):
                 event.accept()
-                self._sync_value_and_saturation_from_triangle(event.pos())
+                self._sync_value_and_saturation_from_triangle(x, y)
                 if is_imprecise:
                     self._pressed_control = "triangle"
                 return
@@ -67,46 +335,53 @@ class ColorRing(QtWidgets.QWidget):
         event.ignore()
 
     def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
-        if self._pressed_control == "ring":
-            event.accept()
-            self._sync_hue_from_ring(event.pos())
-        elif self._pressed_control == "triangle":
-            event.accept()
-            self._sync_value_and_saturation_from_triangle(event.pos())
-        else:
+        if self._pressed_control is None:
             event.ignore()
+            return
+        event.accept()
+        self._pending_x = event.x()
+        self._pending_y = event.y()
+        schedule(self._scheduler, self, self._sync_pressed_control)
 
     def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
+        if self._pressed_control is not None:
+            unschedule(self._scheduler, self)
+            self._pending_x = event.x()
+            self._pending_y = event.y()
+            self._sync_pressed_control()
         self._pressed_control = None
 
-    def _sync_value_and_saturation_from_triangle(
-        self, pos: QtCore.QPoint
-    ) -> None:
-        transform, _ = self._get_triangle_transform().inverted()
-        pos = transform.map(pos)
-
-        height = self._triangle_height
-        side = self._triangle_side
+    def _model_changed(self) -> None:
+        if self._painted_marker is None or self._model.h != self._painted_hue:
+            schedule_update(self._scheduler, self)
+        else:
+            schedule_update(self._scheduler, self, self._painted_marker)
+            schedule_update(
+                self._scheduler,
+                self,
+                self._get_triangle_marker_rect(self._triangle_hue),
+            )
 
-        p1c, p2c, p3c = self._get_triangle_colors()
-        y_ratio = pos.y() / height
-        y_ratio = clamp(y_ratio, 0, 1)
-        x1 = (1 - y_ratio) / 2
-        x2 = 1 - x1
-        x_ratio = ((pos.x() / side) - x1) / max(sys.float_info.min, x2 - x1)
-        x_ratio = clamp(x_ratio, 0, 1)
+    def _invalidate(self) -> None:
+        self._renderer.invalidate()
+        self._triangle_geometry = None
+        self.update()
 
-        y_c1 = blend(p1c, p2c, y_ratio)
-        y_c2 = blend(p1c, p3c, y_ratio)
-        x_c = blend(y_c1, y_c2, x_ratio)
+    def _sync_pressed_control(self) -> None:
+        if self._pressed_control == "ring":
+            self._sync_hue_from_ring(self._pending_x, self._pending_y)
+        elif self._pressed_control == "triangle":
+            self._sync_value_and_saturation_from_triangle(
+                self._pending_x, self._pending_y
+            )
 
-        self._model.s = x_c.saturationF()
-        self._model.v = x_c.valueF()
+    def _sync_value_and_saturation_from_triangle(self, x: int, y: int) -> None:
+        s, v = self._get_triangle_geometry().saturation_and_value(x, y)
+        self._model.set_hsva(self._model.h, s, v)
 
-    def _sync_hue_from_ring(self, pos: QtCore.QPoint) -> None:
-        pos -= self.rect().center()
-        x = pos.x()
-        y = pos.y()
+    def _sync_hue_from_ring(self, x: int, y: int) -> None:
+        x -= (self.width() - 1) // 2
+        y -= (self.height() - 1) // 2
         theta = (math.atan2(y, x) / (2 * math.pi)) % 1.0
         self._model.h = theta
 
@@ -124,26 +399,40 @@ class ColorRing(QtWidgets.QWidget):
 
     @property
     def _triangle_side(self) -> int:
-        return int(self._ring_inner_radius * 3 / math.sqrt(3))
+        return _triangle_size(self._ring_inner_radius)[0]
 
     @property
     def _triangle_height(self) -> int:
-        return int(self._ring_inner_radius * 3 / 2)
-
-    def _get_triangle_transform(self) -> QtGui.QTransform:
-        transform = QtGui.QTransform()
-        transform.translate(self._ring_outer_radius, self._ring_outer_radius)
-        transform.rotate(self._model.h * 360.0)
-        transform.rotate(90.0)
-        transform.translate(
-            -self._triangle_side / 2, -self._triangle_height * 2 / 3
-        )
-        return transform
+        return _triangle_size(self._ring_inner_radius)[1]
+
+    def _get_triangle_geometry(
+        self, hue: T.Optional[float] = None
+    ) -> _TriangleGeometry:
+        if hue is None:
+            hue = self._model.h
+        key = (hue, self.width(), self.height())
+        if (
+            self._triangle_geometry is None
+            or self._triangle_geometry_key != key
+        ):
+            self._triangle_geometry = _TriangleGeometry(
+                hue,
+                self._ring_outer_radius,
+                self._triangle_side,
+                self._triangle_height,
+            )
+            self._triangle_geometry_key = key
+        return self._triangle_geometry
+
+    def _get_triangle_transform(
+        self, hue: T.Optional[float] = None
+    ) -> QtGui.QTransform:
+        return self._get_triangle_geometry(hue).transform
 
     def _get_triangle_points(
         self, use_transform: bool = True
     ) -> T.Tuple[QtCore.QPoint, QtCore.QPoint, QtCore.QPoint]:
-        p1 = QtCore.QPoint(self._triangle_side / 2, 0)
+        p1 = QtCore.QPoint(self._triangle_side // 2, 0)
         p2 = QtCore.QPoint(0, self._triangle_height)
         p3 = QtCore.QPoint(self._triangle_side, self._triangle_height)
         if use_transform:
@@ -153,92 +442,36 @@ class ColorRing(QtWidgets.QWidget):
             p3 = transform.map(p3)
         return (p1, p2, p3)
 
-    def _get_triangle_colors(
-        self
-    ) -> T.Tuple[QtGui.QColor, QtGui.QColor, QtGui.QColor]:
-        p1c = QtGui.QColor.fromHsvF(self._model.h, 1, 1)
-        p2c = QtGui.QColor.fromHsvF(self._model.h, 1, 0)
-        p3c = QtGui.QColor.fromHsvF(self._model.h, 0, 1)
-        return (p1c, p2c, p3c)
-
-    def _draw_ring(self) -> QtGui.QImage:
-        image = QtGui.QImage(
-            self._ring_outer_diameter,
-            self._ring_outer_diameter,
-            QtGui.QImage.Format_ARGB32,
-        )
-        image.fill(0)
-
-        painter = QtGui.QPainter(image)
+    def _draw_hue_marker(self, painter: QtGui.QPainter) -> None:
+        hue = self._model.h
+        painter.save()
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-
-        painter.setPen(QtCore.Qt.NoPen)
-        painter.setBrush(QtCore.Qt.white)
-        painter.drawEllipse(
-            0, 0, self._ring_outer_diameter, self._ring_outer_diameter
-        )
-
-        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
-        painter.setBrush(QtCore.Qt.transparent)
-        painter.drawEllipse(
-            self._ring_width,
-            self._ring_width,
-            self._ring_inner_diameter,
-            self._ring_inner_diameter,
-        )
-
-        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceAtop)
-        painter.setBrush(QtGui.QBrush(self._ring_gradient))
-        painter.drawRect(image.rect())
-
-        theta = self._model.h
         painter.setPen(
             QtGui.QPen(
-                black_or_white(QtGui.QColor.fromHsvF(self._model.h, 1, 1)), 1.5
+                black_or_white(QtGui.QColor.fromRgbF(*hsv_to_rgb(hue, 1, 1))),
+                1.5,
             )
         )
         painter.translate(self._ring_outer_radius, self._ring_outer_radius)
-        painter.rotate(self._model.h * 360.0)
-        painter.drawLine(0, 0, self._ring_outer_diameter, 0)
-
-        return image
-
-    def _draw_triangle(self) -> QtGui.QImage:
-        height = self._triangle_height
-        side = self._triangle_side
-
-        image = QtGui.QImage(
-            self._ring_outer_diameter,
-            self._ring_outer_diameter,
-            QtGui.QImage.Format_ARGB32,
+        painter.rotate(hue * 360.0)
+        painter.drawLine(
+            self._ring_inner_radius, 0, self._ring_outer_radius, 0
         )
-        image.fill(0)
+        painter.restore()
 
-        painter = QtGui.QPainter(image)
-        painter.setRenderHint(painter.Antialiasing)
+    def _draw_triangle_marker(
+        self, painter: QtGui.QPainter, hue: T.Optional[float] = None
+    ) -> None:
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setTransform(self._get_triangle_transform(hue))
+        painter.setPen(QtGui.QPen(black_or_white(self._model.color), 1.5))
+        painter.setBrush(QtCore.Qt.NoBrush)
+        painter.drawEllipse(self._get_triangle_marker_ellipse())
+        painter.restore()
 
+    def _get_triangle_marker_ellipse(self) -> QtCore.QRect:
         p1, p2, p3 = self._get_triangle_points(use_transform=False)
-        p1c, p2c, p3c = self._get_triangle_colors()
-
-        painter.setPen(QtCore.Qt.NoPen)
-        painter.setBrush(QtCore.Qt.black)
-        painter.setTransform(self._get_triangle_transform())
-        painter.drawPolygon(p1, p2, p3)
-        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceAtop)
-
-        for y in range(0, height):
-            ratio = y / height
-            x1 = (1 - ratio) / 2
-            x2 = 1 - x1
-            c1 = blend(p1c, p2c, ratio)
-            c2 = blend(p1c, p3c, ratio)
-
-            gradient = QtGui.QLinearGradient(x1 * side, y, x2 * side, y)
-            gradient.setColorAt(0, c1)
-            gradient.setColorAt(1, c2)
-            painter.setBrush(gradient)
-            painter.drawRect(0, y, side, 2)
-
         v = self._model.v
         s = self._model.s
         cx = math.floor(
@@ -247,10 +480,14 @@ class ColorRing(QtWidgets.QWidget):
         cy = math.floor(
             p2.y() + (p3.y() - p2.y()) * v + (p1.y() - p3.y()) * s * v + 0.5
         )
-
-        painter.setPen(QtGui.QPen(black_or_white(self._model.color), 1.5))
-        painter.setBrush(QtCore.Qt.NoBrush)
-        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
-        painter.drawEllipse(QtCore.QRect(cx - 5, cy - 5, 10, 10))
-
-        return image
+        return QtCore.QRect(cx - 5, cy - 5, 10, 10)
+
+    def _get_triangle_marker_rect(
+        self, hue: T.Optional[float] = None
+    ) -> QtCore.QRect:
+        return (
+            self._get_triangle_transform(hue)
+            .mapRect(QtCore.QRectF(self._get_triangle_marker_ellipse()))
+            .adjusted(-2, -2, 2, 2)
+            .toAlignedRect()
+        )
@@ -1,19 +1,119 @@
+import functools
+import math
 import typing as T
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-from .color_model import ColorModel
+from .alpha_grid import AlphaGrid, default_alpha_grid
+from .color_model import ColorModel, ColorValue, hsv_to_rgb
+from .profiling import profile_paint
+from .scheduler import FrameScheduler, schedule
 from .util import is_imprecise_click, is_precise_click
 
 
+def gradient_endpoints(
+    channel: str,
+    hsv: T.Tuple[float, float, float],
+    rgb: T.Tuple[float, float, float],
+) -> T.Tuple[QtGui.QColor, QtGui.QColor]:
+    if channel in ("h", "s", "v"):
+        index = "hsv".index(channel)
+        start = hsv_to_rgb(*hsv[:index], 0.0, *hsv[index + 1 :])
+        end = hsv_to_rgb(*hsv[:index], 1.0, *hsv[index + 1 :])
+    elif channel in ("r", "g", "b"):
+        index = "rgb".index(channel)
+        start = (*rgb[:index], 0.0, *rgb[index + 1 :])
+        end = (*rgb[:index], 1.0, *rgb[index + 1 :])
+    else:
+        raise ValueError(f"unknown channel: {channel!r}")
+    return (QtGui.QColor.fromRgbF(*start), QtGui.QColor.fromRgbF(*end))
+
+
+GradientStops = T.Tuple[T.Tuple[float, QtGui.QColor], ...]
+
+_HUE_STOPS: GradientStops = (
+    (0 / 6, QtGui.QColor(255, 0, 0, 255)),
+    (1 / 6, QtGui.QColor(255, 255, 0, 255)),
+    (2 / 6, QtGui.QColor(0, 255, 0, 255)),
+    (3 / 6, QtGui.QColor(0, 255, 255, 255)),
+    (4 / 6, QtGui.QColor(0, 0, 255, 255)),
+    (5 / 6, QtGui.QColor(255, 0, 255, 255)),
+    (6 / 6, QtGui.QColor(255, 0, 0, 255)),
+)
+
+
+@functools.lru_cache(maxsize=64)
+def gradient_stops(
+    channel: str,
+    hsv: T.Tuple[float, float, float],
+    rgb: T.Tuple[float, float, float],
+) -> GradientStops:
+    if channel == "h":
+        return _HUE_STOPS
+    if channel == "a":
+        color = QtGui.QColor.fromRgbF(*rgb)
+        return (
+            (0.0, QtGui.QColor(color.red(), color.green(), color.blue(), 0)),
+            (1.0, QtGui.QColor(color.red(), color.green(), color.blue(), 255)),
+        )
+    start, end = gradient_endpoints(channel, hsv, rgb)
+    return ((0.0, start), (1.0, end))
+
+
+def paint_groove(
+    painter: QtGui.QPainter, rect: QtCore.QRect, stops: GradientStops
+) -> None:
+    gradient = QtGui.QLinearGradient(rect.topLeft(), rect.topRight())
+    for position, color in stops:
+        gradient.setColorAt(position, color)
+    painter.save()
+    painter.setPen(QtCore.Qt.NoPen)
+    painter.setBrush(gradient)
+    painter.drawRect(rect)
+    painter.restore()
+
+
+def render_slider_groove(
+    channel: str,
+    color: QtGui.QColor,
+    width: int,
+    height: int,
+    device_pixel_ratio: float = 1.0,
+    alpha_grid: T.Optional[AlphaGrid] = None,
+) -> QtGui.QImage:
+    value = ColorValue(color.redF(), color.greenF(), color.blueF())
+    stops = gradient_stops(
+        channel, (value.h, value.s, value.v), (value.r, value.g, value.b)
+    )
+    image = QtGui.QImage(
+        int(math.ceil(width * device_pixel_ratio)),
+        int(math.ceil(height * device_pixel_ratio)),
+        QtGui.QImage.Format_ARGB32_Premultiplied,
+    )
+    image.setDevicePixelRatio(device_pixel_ratio)
+    image.fill(0)
+    rect = QtCore.QRect(0, 0, width, height)
+
+    painter = QtGui.QPainter(image)
+    if alpha_grid is None:
+        painter.drawTiledPixmap(rect, default_alpha_grid())
+    else:
+        painter.drawPixmap(
+            0, 0, alpha_grid.tiled(rect.size(), device_pixel_ratio)
+        )
+    paint_groove(painter, rect, stops)
+    painter.end()
+    return image
+
+
 class ColorSlider(QtWidgets.QAbstractSlider):
     _thumb_size = 8
 
     def __init__(
         self,
         parent: QtWidgets.QWidget,
-        gradient_decorator: T.Callable[[QtGui.QLinearGradient], None],
-        alpha_grid: QtGui.QPixmap,
+        stops_provider: T.Callable[[], GradientStops],
+        alpha_grid: AlphaGrid,
         value: int,
     ) -> None:
         super().__init__(
@@ -23,35 +123,35 @@ class ColorSlider(QtWidgets.QAbstractSlider):
             orientation=QtCore.Qt.Horizontal,
             value=value,
         )
-        self._gradient_decorator = gradient_decorator
+        self._stops_provider = stops_provider
         self._alpha_grid = alpha_grid
+        self._alpha_grid.changed.connect(self.update)
         self._pressed_control = QtWidgets.QStyle.SC_None
 
         self.setSizePolicy(
             QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Maximum
         )
 
-    def setValue(self, value: float) -> None:
+    def setValue(self, value: int) -> None:
         super().setValue(value)
         self.update()
 
     def sizeHint(self) -> T.Tuple[int, int]:
         return QtCore.QSize(300, 25)
 
+    @profile_paint
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
         groove_rect = self._groove_rect
         handle_rect = self._handle_rect
 
-        gradient = QtGui.QLinearGradient(
-            groove_rect.topLeft(), groove_rect.topRight()
-        )
-        self._gradient_decorator(gradient)
-
         painter = QtGui.QPainter(self)
-        painter.drawTiledPixmap(groove_rect, self._alpha_grid)
-        painter.setPen(QtCore.Qt.NoPen)
-        painter.setBrush(gradient)
-        painter.drawRect(groove_rect)
+        painter.drawPixmap(
+            groove_rect.topLeft(),
+            self._alpha_grid.tiled(
+                groove_rect.size(), self.devicePixelRatioF()
+            ),
+        )
+        paint_groove(painter, groove_rect, self._stops_provider())
 
         opt = QtWidgets.QStyleOptionFrame()
         opt.rect = groove_rect
@@ -144,7 +244,7 @@ class ColorSlider(QtWidgets.QAbstractSlider):
     @property
     def _handle_rect(self) -> QtCore.QRect:
         x = (self.value() - self.minimum()) / (self.maximum() - self.minimum())
-        x = x * (self.width() - self._thumb_size * 2)
+        x = int(x * (self.width() - self._thumb_size * 2))
         return QtCore.QRect(x, 0, self._thumb_size * 2, self.height())
 
     def _val_from_point(self, pos: QtCore.QPoint) -> int:
@@ -157,28 +257,31 @@ class ColorSlider(QtWidgets.QAbstractSlider):
 
 
 class BaseColorControl(QtWidgets.QWidget):
+    _channel = ""
+
     def __init__(
         self,
         parent: QtWidgets.QWidget,
         model: ColorModel,
-        alpha_grid: QtGui.QPixmap,
+        alpha_grid: AlphaGrid,
+        scheduler: T.Optional[FrameScheduler] = None,
     ) -> None:
         super().__init__(parent)
         self._model = model
+        self._scheduler = scheduler
+        self._syncing = False
 
         self._slider = ColorSlider(
             self,
-            lambda gradient: self._decorate_gradient(
-                gradient, self._model.color
-            ),
+            self._get_gradient_stops,
             alpha_grid,
-            value=int(self._get_value(self._model) * 255),
+            value=self._get_int_value(),
         )
         self._up_down = QtWidgets.QSpinBox(
             self,
             minimum=0,
             maximum=255,
-            value=int(self._get_value(self._model) * 255),
+            value=self._get_int_value(),
         )
 
         layout = QtWidgets.QHBoxLayout(self)
@@ -188,7 +291,11 @@ class BaseColorControl(QtWidgets.QWidget):
 
         self._slider.valueChanged.connect(self._slider_changed)
         self._up_down.valueChanged.connect(self._up_down_changed)
-        self._model.changed.connect(self._model_changed)
+        self._model.changed.connect(
+            functools.partial(
+                schedule, scheduler, (self, "model"), self._model_changed
+            )
+        )
 
     def _get_value(self, model: ColorModel) -> float:
         raise NotImplementedError("not implemented")
@@ -196,47 +303,54 @@ class BaseColorControl(QtWidgets.QWidget):
     def _set_value(self, model: ColorModel, value: float) -> None:
         raise NotImplementedError("not implemented")
 
-    def _decorate_gradient(
-        self, gradient: QtGui.QLinearGradient, color: QtGui.QColor
-    ) -> None:
-        tmp_model = ColorModel(self._model.color)
-        tmp_model.a = 1.0
-        self._set_value(tmp_model, 0.0)
-        gradient.setColorAt(0, tmp_model.color)
-        self._set_value(tmp_model, 1.0)
-        gradient.setColorAt(1, tmp_model.color)
+    def _get_gradient_stops(self) -> GradientStops:
+        model = self._model
+        return gradient_stops(
+            self._channel,
+            (model.h, model.s, model.v),
+            (model.r, model.g, model.b),
+        )
+
+    def _get_int_value(self) -> int:
+        return int(round(self._get_value(self._model) * 255))
 
     def _model_changed(self) -> None:
-        self._slider.setValue(self._get_value(self._model) * 255)
-        self._up_down.setValue(self._get_value(self._model) * 255)
+        value = self._get_int_value()
+        self._syncing = True
+        try:
+            self._slider.setValue(value)
+            self._up_down.setValue(value)
+        finally:
+            self._syncing = False
 
     def _slider_changed(self) -> None:
-        self._set_value(self._model, self._slider.value() / 255.0)
+        if self._syncing:
+            return
+        schedule(
+            self._scheduler,
+            (self, "slider"),
+            lambda: self._set_value(self._model, self._slider.value() / 255.0),
+        )
 
     def _up_down_changed(self) -> None:
+        if self._syncing:
+            return
         self._set_value(self._model, self._up_down.value() / 255.0)
 
 
 class HueColorControl(BaseColorControl):
+    _channel = "h"
+
     def _get_value(self, model: ColorModel) -> float:
         return model.h
 
     def _set_value(self, model: ColorModel, value: float) -> None:
         model.h = value
 
-    def _decorate_gradient(
-        self, gradient: QtGui.QLinearGradient, color: QtGui.QColor
-    ) -> None:
-        gradient.setColorAt(0 / 6, QtGui.QColor(255, 0, 0, 255))
-        gradient.setColorAt(1 / 6, QtGui.QColor(255, 255, 0, 255))
-        gradient.setColorAt(2 / 6, QtGui.QColor(0, 255, 0, 255))
-        gradient.setColorAt(3 / 6, QtGui.QColor(0, 255, 255, 255))
-        gradient.setColorAt(4 / 6, QtGui.QColor(0, 0, 255, 255))
-        gradient.setColorAt(5 / 6, QtGui.QColor(255, 0, 255, 255))
-        gradient.setColorAt(6 / 6, QtGui.QColor(255, 0, 0, 255))
-
 
 class SaturationColorControl(BaseColorControl):
+    _channel = "s"
+
     def _get_value(self, model: ColorModel) -> float:
         return model.s
 
@@ -245,6 +359,8 @@ class SaturationColorControl(BaseColorControl):
 
 
 class ValueColorControl(BaseColorControl):
+    _channel = "v"
+
     def _get_value(self, model: ColorModel) -> float:
         return model.v
 
@@ -253,6 +369,8 @@ class ValueColorControl(BaseColorControl):
 
 
 class RedColorControl(BaseColorControl):
+    _channel = "r"
+
     def _get_value(self, model: ColorModel) -> float:
         return model.r
 
@@ -261,6 +379,8 @@ class RedColorControl(BaseColorControl):
 
 
 class GreenColorControl(BaseColorControl):
+    _channel = "g"
+
     def _get_value(self, model: ColorModel) -> float:
         return model.g
 
@@ -269,6 +389,8 @@ class GreenColorControl(BaseColorControl):
 
 
 class BlueColorControl(BaseColorControl):
+    _channel = "b"
+
     def _get_value(self, model: ColorModel) -> float:
         return model.b
 
@@ -277,18 +399,10 @@ class BlueColorControl(BaseColorControl):
 
 
 class AlphaColorControl(BaseColorControl):
+    _channel = "a"
+
     def _get_value(self, model: ColorModel) -> float:
         return model.a
 
     def _set_value(self, model: ColorModel, value: float) -> None:
         model.a = value
-
-    def _decorate_gradient(
-        self, gradient: QtGui.QLinearGradient, color: QtGui.QColor
-    ) -> None:
-        gradient.setColorAt(
-            0, QtGui.QColor(color.red(), color.green(), color.blue(), 0)
-        )
-        gradient.setColorAt(
-            1, QtGui.QColor(color.red(), color.green(), color.blue(), 255)
-        )
@@ -1,10 +1,20 @@
 import enum
+import functools
+import math
+import typing as T
 
+import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from .color_model import ColorModel, black_or_white
+from .profiling import profile_paint
+from .raster import hsv_to_rgb, image_from_array, pixel_centers, to_rgba8
+from .scheduler import FrameScheduler, schedule, schedule_update, unschedule
+from .threaded_render import ThreadedRenderer
 from .util import is_imprecise_click, is_precise_click
 
+_PLANE_STEPS = 1024
+
 
 class ColorSquareStyle(enum.IntEnum):
     Hue = 1
@@ -15,20 +25,80 @@ class ColorSquareStyle(enum.IntEnum):
     Blue = 6
 
 
+@functools.lru_cache(maxsize=8)
+def _render_square_plane(
+    square_style: ColorSquareStyle,
+    fixed_step: int,
+    width: int,
+    height: int,
+    device_pixel_ratio: float,
+) -> QtGui.QImage:
+    fixed = np.float32(fixed_step / _PLANE_STEPS)
+    x, y = pixel_centers(
+        int(math.ceil(width * device_pixel_ratio)),
+        int(math.ceil(height * device_pixel_ratio)),
+        device_pixel_ratio,
+    )
+    x = np.clip(x / width, 0, 1)
+    y = np.clip(1 - y / height, 0, 1)
+
+    if square_style == ColorSquareStyle.Hue:
+        rgb = hsv_to_rgb(fixed, x, y)
+    elif square_style == ColorSquareStyle.Saturation:
+        rgb = hsv_to_rgb(x, fixed, y)
+    elif square_style == ColorSquareStyle.Value:
+        rgb = hsv_to_rgb(x, y, fixed)
+    elif square_style == ColorSquareStyle.Red:
+        rgb = np.stack(np.broadcast_arrays(fixed, y, x), axis=-1)
+    elif square_style == ColorSquareStyle.Green:
+        rgb = np.stack(np.broadcast_arrays(y, fixed, x), axis=-1)
+    elif square_style == ColorSquareStyle.Blue:
+        rgb = np.stack(np.broadcast_arrays(x, y, fixed), axis=-1)
+    else:
+        assert False
+
+    return image_from_array(to_rgba8(rgb, np.ones_like(x)), device_pixel_ratio)
+
+
+def render_square_plane(
+    square_style: ColorSquareStyle,
+    fixed: float,
+    width: int,
+    height: int,
+    device_pixel_ratio: float = 1.0,
+) -> QtGui.QImage:
+    return _render_square_plane(
+        square_style, _fixed_step(fixed), width, height, device_pixel_ratio
+    ).copy()
+
+
+def _fixed_step(fixed: float) -> int:
+    return round(max(0.0, min(1.0, fixed)) * _PLANE_STEPS)
+
+
 class ColorSquare(QtWidgets.QFrame):
     def __init__(
         self,
         parent: QtWidgets.QWidget,
         model: ColorModel,
         square_style: ColorSquareStyle = ColorSquareStyle.Hue,
+        scheduler: T.Optional[FrameScheduler] = None,
+        thread_pool: T.Optional[QtCore.QThreadPool] = None,
     ) -> None:
         super().__init__(parent)
 
         self._square_style = square_style
         self._model = model
+        self._scheduler = scheduler
+        self._renderer = ThreadedRenderer(
+            _render_square_plane, thread_pool, self
+        )
+        self._renderer.ready.connect(self.update)
         self._pressed = False
+        self._painted_plane: T.Optional[T.Tuple[ColorSquareStyle, int]] = None
+        self._painted_marker: T.Optional[QtCore.QRect] = None
 
-        self._model.changed.connect(self.update)
+        self._model.changed.connect(self._model_changed)
 
         self.setFrameStyle(QtWidgets.QFrame.Panel | QtWidgets.QFrame.Sunken)
         self.setFixedSize(300, 300)
@@ -44,36 +114,48 @@ class ColorSquare(QtWidgets.QFrame):
         self._square_style = square_style
         self.update()
 
+    @property
+    def thread_pool(self) -> T.Optional[QtCore.QThreadPool]:
+        return self._renderer.thread_pool
+
+    def set_thread_pool(
+        self, thread_pool: T.Optional[QtCore.QThreadPool]
+    ) -> None:
+        self._renderer.set_thread_pool(thread_pool)
+
+    @profile_paint
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
-        rect = self.rect()
-        rect -= QtCore.QMargins(*[self.lineWidth()] * 4)
+        rect = self._get_plane_rect()
 
         painter = QtGui.QPainter(self)
         painter.setRenderHint(painter.Antialiasing)
-
-        for y in range(rect.top(), rect.top() + rect.height()):
-            x1 = 0
-            x2 = self.width()
-            gradient = QtGui.QLinearGradient(x1, y, x2, y)
-            self._decorate_gradient(gradient, y / rect.height())
-
-            painter.setPen(QtCore.Qt.NoPen)
-            painter.setBrush(gradient)
-            painter.drawRect(QtCore.QRect(rect.left(), y, rect.width(), 1))
-
-        pos = self._get_color_pos()
-        pos.setX(pos.x() * rect.width())
-        pos.setY(pos.y() * rect.height())
-
-        cx = pos.x()
-        cy = pos.y()
+        painter.drawImage(
+            rect.topLeft(),
+            self._renderer.image(
+                (
+                    self._square_style,
+                    _fixed_step(self._get_fixed_value()),
+                    rect.width(),
+                    rect.height(),
+                    self.devicePixelRatioF(),
+                )
+            ),
+        )
 
         painter.setPen(QtGui.QPen(black_or_white(self._model.color), 1.5))
         painter.setBrush(QtCore.Qt.NoBrush)
-        painter.drawEllipse(QtCore.QRect(cx - 5, cy - 5, 10, 10))
+        painter.drawEllipse(self._get_marker_ellipse())
+        painter.end()
+
+        self._painted_plane = self._renderer.key[:2]
+        self._painted_marker = self._get_marker_rect()
 
         super().paintEvent(event)
 
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        self._invalidate()
+        super().resizeEvent(event)
+
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
         is_precise = is_precise_click(event.button(), self.style())
         is_imprecise = is_imprecise_click(event.button(), self.style())
@@ -90,12 +172,47 @@ class ColorSquare(QtWidgets.QFrame):
     def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
         if self._pressed:
             event.accept()
-            self._sync(event.pos())
+            schedule(
+                self._scheduler,
+                self,
+                functools.partial(self._sync, event.pos()),
+            )
         else:
             event.ignore()
 
     def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
-        self._pressed = None
+        if self._pressed:
+            unschedule(self._scheduler, self)
+            self._sync(event.pos())
+        self._pressed = False
+
+    def _model_changed(self) -> None:
+        plane = (self._square_style, _fixed_step(self._get_fixed_value()))
+        if self._painted_marker is None or plane != self._painted_plane:
+            schedule_update(self._scheduler, self)
+        else:
+            schedule_update(self._scheduler, self, self._painted_marker)
+            schedule_update(self._scheduler, self, self._get_marker_rect())
+
+    def _invalidate(self) -> None:
+        self._renderer.invalidate()
+        self._painted_plane = None
+        self.update()
+
+    def _get_plane_rect(self) -> QtCore.QRect:
+        return self.rect() - QtCore.QMargins(*[self.lineWidth()] * 4)
+
+    def _get_marker_ellipse(self) -> QtCore.QRectF:
+        rect = self._get_plane_rect()
+        pos = self._get_color_pos()
+        cx = pos.x() * rect.width()
+        cy = pos.y() * rect.height()
+        return QtCore.QRectF(cx - 5, cy - 5, 10, 10)
+
+    def _get_marker_rect(self) -> QtCore.QRect:
+        return (
+            self._get_marker_ellipse().adjusted(-2, -2, 2, 2).toAlignedRect()
+        )
 
     def _get_color_pos(self) -> QtCore.QPointF:
         if self._square_style == ColorSquareStyle.Hue:
@@ -113,66 +230,43 @@ class ColorSquare(QtWidgets.QFrame):
         else:
             assert False
 
-    def _decorate_gradient(self, gradient: QtGui.QGradient, y: float) -> None:
+    def _get_fixed_value(self) -> float:
         if self._square_style == ColorSquareStyle.Hue:
-            for i in [0, 1]:
-                gradient.setColorAt(
-                    i, QtGui.QColor.fromHsvF(self._model.h, i, 1 - y)
-                )
-
+            return self._model.h
         elif self._square_style == ColorSquareStyle.Saturation:
-            for i in range(6):
-                gradient.setColorAt(
-                    i / 6, QtGui.QColor.fromHsvF(i / 6, self._model.s, 1 - y)
-                )
-
+            return self._model.s
         elif self._square_style == ColorSquareStyle.Value:
-            for i in range(6):
-                gradient.setColorAt(
-                    i / 6, QtGui.QColor.fromHsvF(i / 6, 1 - y, self._model.v)
-                )
-
+            return self._model.v
         elif self._square_style == ColorSquareStyle.Red:
-            for i in [0, 1]:
-                gradient.setColorAt(
-                    i, QtGui.QColor.fromRgbF(self._model.r, 1 - y, i)
-                )
-
+            return self._model.r
         elif self._square_style == ColorSquareStyle.Green:
-            for i in [0, 1]:
-                gradient.setColorAt(
-                    i, QtGui.QColor.fromRgbF(1 - y, self._model.g, i)
-                )
-
+            return self._model.g
         elif self._square_style == ColorSquareStyle.Blue:
-            for i in [0, 1]:
-                gradient.setColorAt(
-                    i, QtGui.QColor.fromRgbF(i, 1 - y, self._model.b)
-                )
-
+            return self._model.b
         else:
             assert False
 
     def _sync(self, pos: QtCore.QPoint) -> None:
         x = pos.x() / self.rect().width()
         y = pos.y() / self.rect().height()
-        if self._square_style == ColorSquareStyle.Hue:
-            self._model.s = x
-            self._model.v = 1 - y
-        elif self._square_style == ColorSquareStyle.Saturation:
-            self._model.h = x
-            self._model.v = 1 - y
-        elif self._square_style == ColorSquareStyle.Value:
-            self._model.h = x
-            self._model.s = 1 - y
-        elif self._square_style == ColorSquareStyle.Red:
-            self._model.b = x
-            self._model.g = 1 - y
-        elif self._square_style == ColorSquareStyle.Green:
-            self._model.b = x
-            self._model.r = 1 - y
-        elif self._square_style == ColorSquareStyle.Blue:
-            self._model.r = x
-            self._model.g = 1 - y
-        else:
-            assert False
+        with self._model.batch():
+            if self._square_style == ColorSquareStyle.Hue:
+                self._model.s = x
+                self._model.v = 1 - y
+            elif self._square_style == ColorSquareStyle.Saturation:
+                self._model.h = x
+                self._model.v = 1 - y
+            elif self._square_style == ColorSquareStyle.Value:
+                self._model.h = x
+                self._model.s = 1 - y
+            elif self._square_style == ColorSquareStyle.Red:
+                self._model.b = x
+                self._model.g = 1 - y
+            elif self._square_style == ColorSquareStyle.Green:
+                self._model.b = x
+                self._model.r = 1 - y
+            elif self._square_style == ColorSquareStyle.Blue:
+                self._model.r = x
+                self._model.g = 1 - y
+            else:
+                assert False
@@ -1,45 +1,27 @@
 import typing as T
 
-from PyQt5 import QtCore
 
+class Triangle:
+    __slots__ = ("_s0", "_sx", "_sy", "_t0", "_tx", "_ty")
 
-def point_in_triangle(
-    point: QtCore.QPoint,
-    triangle_points: T.Tuple[QtCore.QPoint, QtCore.QPoint, QtCore.QPoint],
-) -> bool:
-    p = point
-    p1, p2, p3 = triangle_points
-    area = 0.5 * (
-        -p2.y() * p3.x()
-        + p1.y() * (-p2.x() + p3.x())
-        + p1.x() * (p2.y() - p3.y())
-        + p2.x() * p3.y()
-    )
-    s = (
-        1
-        / (2 * area)
-        * (
-            p1.y() * p3.x()
-            - p1.x() * p3.y()
-            + (p3.y() - p1.y()) * p.x()
-            + (p1.x() - p3.x()) * p.y()
-        )
-    )
-    t = (
-        1
-        / (2 * area)
-        * (
-            p1.x() * p2.y()
-            - p1.y() * p2.x()
-            + (p1.y() - p2.y()) * p.x()
-            + (p2.x() - p1.x()) * p.y()
-        )
-    )
-    return s > 0 and t > 0 and 1 - s - t > 0
+    def __init__(
+        self,
+        p1: T.Tuple[float, float],
+        p2: T.Tuple[float, float],
+        p3: T.Tuple[float, float],
+    ) -> None:
+        x1, y1 = p1
+        x2, y2 = p2
+        x3, y3 = p3
+        area2 = -y2 * x3 + y1 * (-x2 + x3) + x1 * (y2 - y3) + x2 * y3
+        self._s0 = (y1 * x3 - x1 * y3) / area2
+        self._sx = (y3 - y1) / area2
+        self._sy = (x1 - x3) / area2
+        self._t0 = (x1 * y2 - y1 * x2) / area2
+        self._tx = (y1 - y2) / area2
+        self._ty = (x2 - x1) / area2
 
-
-def point_in_ring(
-    point: QtCore.QPoint, inner_radius: float, outer_radius: float
-) -> bool:
-    dist = (point.y() * point.y() + point.x() * point.x()) ** 0.5
-    return inner_radius <= dist <= outer_radius
+    def contains(self, x: float, y: float) -> bool:
+        s = self._s0 + self._sx * x + self._sy * y
+        t = self._t0 + self._tx * x + self._ty * y
+        return s > 0 and t > 0 and 1 - s - t > 0
@@ -0,0 +1,469 @@
+import array
+import hashlib
+import io
+import mmap
+import os
+import struct
+import typing as T
+from pathlib import Path
+
+import numpy as np
+from PyQt5 import QtCore, QtGui
+
+from .color_arrays import from_hex, to_hex, to_rgba8
+from .color_model import hsv_to_rgb
+from .util import clamp
+
+if T.TYPE_CHECKING:
+    from .color_names import ColorNameIndex
+
+CACHE_SUFFIX = ".pcpal"
+
+_CACHE_MAGIC = b"PQCP"
+_CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct("<4sHHIII")
+_HEX_CHUNK_SIZE = 4096
+
+_LAB_WHITE = (0.96422, 1.0, 0.82521)
+_XYZ_D50_TO_LINEAR_SRGB = (
+    (3.1338561, -1.6168667, -0.4906146),
+    (-0.9787684, 1.9161415, 0.0334540),
+    (0.0719453, -0.2289914, 1.4052427),
+)
+
+
+class Palette:
+    def __init__(
+        self,
+        names: T.Sequence[str],
+        colors: np.ndarray,
+        title: str = "",
+    ) -> None:
+        builder = _PaletteBuilder()
+        builder.extend(names, np.asarray(colors, np.float32))
+        other = builder.build(title)
+        self._title = other._title
+        self._colors = other._colors
+        self._offsets = other._offsets
+        self._names = other._names
+        self._buffer: T.Optional[mmap.mmap] = None
+        self._name_index: T.Optional["ColorNameIndex"] = None
+
+    @classmethod
+    def _from_buffers(
+        cls,
+        title: str,
+        colors: np.ndarray,
+        offsets: np.ndarray,
+        names: T.Union[bytes, memoryview],
+        buffer: T.Optional[mmap.mmap] = None,
+    ) -> "Palette":
+        palette = cls.__new__(cls)
+        palette._title = title
+        palette._colors = colors
+        palette._offsets = offsets
+        palette._names = names
+        palette._buffer = buffer
+        palette._name_index = None
+        return palette
+
+    def __len__(self) -> int:
+        return len(self._colors)
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @property
+    def colors(self) -> np.ndarray:
+        return self._colors
+
+    @property
+    def names(self) -> T.List[str]:
+        return [self.name(i) for i in range(len(self))]
+
+    def name(self, index: int) -> str:
+        start = int(self._offsets[index])
+        end = int(self._offsets[index + 1])
+        return bytes(self._names[start:end]).decode("utf-8")
+
+    def color(self, index: int) -> QtGui.QColor:
+        return QtGui.QColor.fromRgbF(*self._colors[index].tolist())
+
+    def name_index(self) -> T.Optional["ColorNameIndex"]:
+        if not len(self):
+            return None
+        if self._name_index is None:
+            from .color_names import ColorNameIndex
+
+            self._name_index = ColorNameIndex(self.names, self._colors)
+        return self._name_index
+
+
+class _PaletteBuilder:
+    def __init__(self) -> None:
+        self._colors = array.array("f")
+        self._offsets = array.array("I", [0])
+        self._names = bytearray()
+
+    def add(self, name: str, r: float, g: float, b: float, a: float) -> None:
+        self._colors.extend((r, g, b, a))
+        self._names += name.encode("utf-8")
+        self._offsets.append(len(self._names))
+
+    def extend(self, names: T.Iterable[str], colors: np.ndarray) -> None:
+        if colors.shape[-1] == 3:
+            colors = np.concatenate(
+                [colors, np.ones(colors.shape[:-1] + (1,), colors.dtype)],
+                axis=-1,
+            )
+        self._colors.frombytes(
+            np.clip(colors, 0.0, 1.0).astype(np.float32).tobytes()
+        )
+        for name in names:
+            self._names += name.encode("utf-8")
+            self._offsets.append(len(self._names))
+        if len(self._offsets) * 4 != len(self._colors) + 4:
+            raise ValueError("names and colors differ in length")
+
+    def build(self, title: str) -> Palette:
+        return Palette._from_buffers(
+            title,
+            np.frombuffer(self._colors, np.float32).reshape(-1, 4),
+            np.frombuffer(self._offsets, np.uint32),
+            bytes(self._names),
+        )
+
+
+def _lab_to_rgb(
+    lightness: float, a: float, b: float
+) -> T.Tuple[float, float, float]:
+    fy = (lightness + 16) / 116
+    fx = fy + a / 500
+    fz = fy - b / 200
+
+    def f_inv(t: float) -> float:
+        if t > 6 / 29:
+            return t**3
+        return 3 * (6 / 29) ** 2 * (t - 4 / 29)
+
+    xyz = (
+        _LAB_WHITE[0] * f_inv(fx),
+        _LAB_WHITE[1] * f_inv(fy),
+        _LAB_WHITE[2] * f_inv(fz),
+    )
+    rgb = []
+    for row in _XYZ_D50_TO_LINEAR_SRGB:
+        c = clamp(sum(m * v for m, v in zip(row, xyz)), 0.0, 1.0)
+        if c <= 0.0031308:
+            rgb.append(12.92 * c)
+        else:
+            rgb.append(1.055 * c ** (1 / 2.4) - 0.055)
+    return (
+        clamp(rgb[0], 0.0, 1.0),
+        clamp(rgb[1], 0.0, 1.0),
+        clamp(rgb[2], 0.0, 1.0),
+    )
+
+
+def _read_exact(fp: T.BinaryIO, size: int) -> bytes:
+    data = fp.read(size)
+    if len(data) != size:
+        raise ValueError("unexpected end of palette file")
+    return data
+
+
+def _read_gpl(fp: T.BinaryIO, builder: _PaletteBuilder) -> str:
+    lines = io.TextIOWrapper(fp, encoding="utf-8", errors="replace")
+    if lines.readline().strip() != "GIMP Palette":
+        raise ValueError("not a GIMP palette")
+    title = ""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("Name:"):
+            title = line[len("Name:") :].strip()
+            continue
+        if line.startswith("Columns:"):
+            continue
+        parts = line.split(None, 3)
+        if len(parts) < 3:
+            raise ValueError(f"invalid GIMP palette entry: {line!r}")
+        r, g, b = (int(part) / 255 for part in parts[:3])
+        builder.add(parts[3] if len(parts) > 3 else "", r, g, b, 1.0)
+    lines.detach()
+    return title
+
+
+def _read_hex(fp: T.BinaryIO, builder: _PaletteBuilder) -> str:
+    lines = io.TextIOWrapper(fp, encoding="utf-8", errors="replace")
+    codes: T.List[str] = []
+    names: T.List[str] = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith((";", "//")):
+            continue
+        parts = line.split(None, 1)
+        codes.append(parts[0])
+        names.append(parts[1] if len(parts) > 1 else parts[0])
+        if len(codes) == _HEX_CHUNK_SIZE:
+            builder.extend(names, from_hex(codes))
+            codes.clear()
+            names.clear()
+    if codes:
+        builder.extend(names, from_hex(codes))
+    lines.detach()
+    return ""
+
+
+def _aco_color(
+    space: int, w: int, x: int, y: int, z: int
+) -> T.Tuple[float, float, float]:
+    if space == 0:
+        return (w / 0xFFFF, x / 0xFFFF, y / 0xFFFF)
+    if space == 1:
+        return hsv_to_rgb(w / 0xFFFF, x / 0xFFFF, y / 0xFFFF)
+    if space == 2:
+        k = z / 0xFFFF
+        return (w / 0xFFFF * k, x / 0xFFFF * k, y / 0xFFFF * k)
+    if space == 7:
+        x, y = struct.unpack(">hh", struct.pack(">HH", x, y))
+        return _lab_to_rgb(w / 100, x / 100, y / 100)
+    if space == 8:
+        gray = 1 - min(w, 10000) / 10000
+        return (gray, gray, gray)
+    raise ValueError(f"unsupported ACO color space: {space}")
+
+
+def _read_aco(fp: T.BinaryIO, builder: _PaletteBuilder) -> str:
+    version, count = struct.unpack(">HH", _read_exact(fp, 4))
+    if version != 1:
+        raise ValueError("not an ACO palette")
+    start = fp.tell()
+    fp.seek(count * 10, os.SEEK_CUR)
+    header = fp.read(4)
+    if len(header) == 4 and struct.unpack(">HH", header)[0] == 2:
+        count = struct.unpack(">HH", header)[1]
+        named = True
+    else:
+        fp.seek(start)
+        named = False
+    for _ in range(count):
+        space, w, x, y, z = struct.unpack(">5H", _read_exact(fp, 10))
+        name = ""
+        if named:
+            (length,) = struct.unpack(">I", _read_exact(fp, 4))
+            name = _read_exact(fp, length * 2).decode("utf-16-be").rstrip("\0")
+        builder.add(name, *_aco_color(space, w, x, y, z), 1.0)
+    return ""
+
+
+def _read_ase(fp: T.BinaryIO, builder: _PaletteBuilder) -> str:
+    signature, _major, _minor, blocks = struct.unpack(
+        ">4sHHI", _read_exact(fp, 12)
+    )
+    if signature != b"ASEF":
+        raise ValueError("not an ASE palette")
+    for _ in range(blocks):
+        block_type, length = struct.unpack(">HI", _read_exact(fp, 6))
+        if block_type != 0x0001:
+            fp.seek(length, os.SEEK_CUR)
+            continue
+        block = _read_exact(fp, length)
+        (name_length,) = struct.unpack_from(">H", block, 0)
+        offset = 2 + name_length * 2
+        name = block[2:offset].decode("utf-16-be").rstrip("\0")
+        model = block[offset : offset + 4]
+        offset += 4
+        if model == b"RGB ":
+            rgb = struct.unpack_from(">3f", block, offset)
+        elif model == b"CMYK":
+            c, m, y, k = struct.unpack_from(">4f", block, offset)
+            rgb = ((1 - c) * (1 - k), (1 - m) * (1 - k), (1 - y) * (1 - k))
+        elif model == b"LAB ":
+            lightness, a, b = struct.unpack_from(">3f", block, offset)
+            rgb = _lab_to_rgb(lightness * 100, a, b)
+        elif model == b"Gray":
+            (gray,) = struct.unpack_from(">f", block, offset)
+            rgb = (gray, gray, gray)
+        else:
+            raise ValueError(f"unsupported ASE color model: {model!r}")
+        builder.add(name, *rgb, 1.0)
+    return ""
+
+
+_READERS: T.Dict[str, T.Callable[[T.BinaryIO, _PaletteBuilder], str]] = {
+    ".gpl": _read_gpl,
+    ".aco": _read_aco,
+    ".ase": _read_ase,
+}
+
+
+def read_palette(path: T.Union[str, Path]) -> Palette:
+    path = Path(path)
+    reader = _READERS.get(path.suffix.lower(), _read_hex)
+    builder = _PaletteBuilder()
+    with path.open("rb") as fp:
+        title = reader(fp, builder)
+    return builder.build(title or path.stem)
+
+
+def _write_gpl(palette: Palette, fp: T.BinaryIO) -> None:
+    fp.write(f"GIMP Palette\nName: {palette.title}\n#\n".encode("utf-8"))
+    rgba = to_rgba8(palette.colors)
+    for i in range(len(palette)):
+        r, g, b, _a = rgba[i].tolist()
+        fp.write(f"{r:3d} {g:3d} {b:3d}\t{palette.name(i)}\n".encode("utf-8"))
+
+
+def _write_hex(palette: Palette, fp: T.BinaryIO) -> None:
+    for start in range(0, len(palette), _HEX_CHUNK_SIZE):
+        chunk = palette.colors[start : start + _HEX_CHUNK_SIZE]
+        codes = np.where(
+            chunk[:, 3] < 1.0, to_hex(chunk, True), to_hex(chunk)
+        ).tolist()
+        for i, code in enumerate(codes, start):
+            name = palette.name(i)
+            line = code if not name or name == code else f"{code} {name}"
+            fp.write(f"{line}\n".encode("utf-8"))
+
+
+def _write_aco(palette: Palette, fp: T.BinaryIO) -> None:
+    rgb16 = np.floor(palette.colors[:, :3] * 0xFFFF + 0.5).astype(np.uint16)
+    for version in (1, 2):
+        fp.write(struct.pack(">HH", version, len(palette)))
+        for i in range(len(palette)):
+            r, g, b = rgb16[i].tolist()
+            fp.write(struct.pack(">5H", 0, r, g, b, 0))
+            if version == 2:
+                name = palette.name(i) + "\0"
+                fp.write(struct.pack(">I", len(name.encode("utf-16-be")) // 2))
+                fp.write(name.encode("utf-16-be"))
+
+
+def _write_ase(palette: Palette, fp: T.BinaryIO) -> None:
+    fp.write(struct.pack(">4sHHI", b"ASEF", 1, 0, len(palette)))
+    for i in range(len(palette)):
+        name = (palette.name(i) + "\0").encode("utf-16-be")
+        block = (
+            struct.pack(">H", len(name) // 2)
+            + name
+            + b"RGB "
+            + struct.pack(">3fH", *palette.colors[i, :3].tolist(), 2)
+        )
+        fp.write(struct.pack(">HI", 0x0001, len(block)))
+        fp.write(block)
+
+
+_WRITERS: T.Dict[str, T.Callable[[Palette, T.BinaryIO], None]] = {
+    ".gpl": _write_gpl,
+    ".aco": _write_aco,
+    ".ase": _write_ase,
+}
+
+
+def save_palette(palette: Palette, path: T.Union[str, Path]) -> None:
+    path = Path(path)
+    writer = _WRITERS.get(path.suffix.lower(), _write_hex)
+    with path.open("wb") as fp:
+        writer(palette, fp)
+
+
+def write_palette_cache(palette: Palette, path: T.Union[str, Path]) -> None:
+    path = Path(path)
+    title = palette.title.encode("utf-8")
+    names = bytes(palette._names)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as fp:
+        fp.write(
+            _CACHE_HEADER.pack(
+                _CACHE_MAGIC,
+                _CACHE_VERSION,
+                0,
+                len(palette),
+                len(names),
+                len(title),
+            )
+        )
+        fp.write(np.ascontiguousarray(palette.colors, "<f4").tobytes())
+        fp.write(np.ascontiguousarray(palette._offsets, "<u4").tobytes())
+        fp.write(title)
+        fp.write(names)
+    os.replace(tmp_path, path)
+
+
+def read_palette_cache(path: T.Union[str, Path]) -> Palette:
+    with open(path, "rb") as fp:
+        buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < _CACHE_HEADER.size:
+        raise ValueError("truncated palette cache")
+    magic, version, _flags, count, names_size, title_size = (
+        _CACHE_HEADER.unpack_from(buffer)
+    )
+    if magic != _CACHE_MAGIC or version != _CACHE_VERSION:
+        raise ValueError("not a palette cache")
+    offset = _CACHE_HEADER.size
+    size = offset + count * 16 + (count + 1) * 4 + title_size + names_size
+    if size > len(buffer):
+        raise ValueError("truncated palette cache")
+    colors = np.frombuffer(buffer, "<f4", count * 4, offset).reshape(-1, 4)
+    offset += colors.nbytes
+    offsets = np.frombuffer(buffer, "<u4", count + 1, offset)
+    offset += offsets.nbytes
+    if offsets[0] != 0 or offsets[-1] != names_size:
+        raise ValueError("corrupt palette cache")
+    if count and (np.diff(offsets.astype(np.int64)) < 0).any():
+        raise ValueError("corrupt palette cache")
+    title = buffer[offset : offset + title_size].decode("utf-8")
+    offset += title_size
+    names = memoryview(buffer)[offset : offset + names_size]
+    return Palette._from_buffers(title, colors, offsets, names, buffer)
+
+
+def default_cache_dir() -> Path:
+    return (
+        Path(
+            QtCore.QStandardPaths.writableLocation(
+                QtCore.QStandardPaths.GenericCacheLocation
+            )
+        )
+        / "pyqtcolordialog"
+        / "palettes"
+    )
+
+
+def load_palette(
+    path: T.Union[str, Path],
+    use_cache: bool = True,
+    cache_dir: T.Optional[Path] = None,
+) -> Palette:
+    path = Path(path).resolve()
+    if not use_cache:
+        return read_palette(path)
+
+    stat = path.stat()
+    path_key = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+    version_key = hashlib.sha1(
+        f"{stat.st_mtime_ns}\0{stat.st_size}".encode("utf-8")
+    ).hexdigest()
+    cache_dir = cache_dir or default_cache_dir()
+    cache_path = cache_dir / f"{path_key}-{version_key}{CACHE_SUFFIX}"
+    try:
+        return read_palette_cache(cache_path)
+    except (OSError, ValueError):
+        pass
+
+    palette = read_palette(path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_palette_cache(palette, cache_path)
+    except OSError:
+        return palette
+    for stale_path in cache_dir.glob(f"{path_key}-*{CACHE_SUFFIX}"):
+        if stale_path != cache_path:
+            try:
+                stale_path.unlink()
+            except OSError:
+                pass
+    return palette
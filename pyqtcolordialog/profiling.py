@@ -0,0 +1,201 @@
+import collections
+import functools
+import os
+import sys
+import time
+import typing as T
+import weakref
+
+from PyQt5 import QtCore, QtGui, QtWidgets, sip
+
+from .color_model import ColorModel
+
+ENV_VAR = "PYQTCOLORDIALOG_PROFILE"
+
+_INPUT_EVENTS = {
+    QtCore.QEvent.MouseButtonPress,
+    QtCore.QEvent.MouseButtonRelease,
+    QtCore.QEvent.MouseMove,
+    QtCore.QEvent.KeyPress,
+    QtCore.QEvent.Wheel,
+}
+
+
+class _Timing:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def to_dict(self) -> T.Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total * 1000 / max(1, self.count),
+            "max_ms": self.max * 1000,
+        }
+
+
+class Profiler(QtCore.QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self._paints: T.DefaultDict[str, _Timing] = collections.defaultdict(
+            _Timing
+        )
+        self._emissions: T.DefaultDict[str, T.Counter[str]] = (
+            collections.defaultdict(collections.Counter)
+        )
+        self._latency = _Timing()
+        self._pending_input: T.Optional[float] = None
+        self._windows: T.MutableSet[QtWidgets.QWidget] = weakref.WeakSet()
+        self._models: T.MutableMapping[ColorModel, T.Callable[[], None]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def watch_model(self, model: ColorModel, name: str) -> None:
+        callback = functools.partial(self._record_emission, name)
+        model.changed.connect(callback)
+        self._models[model] = callback
+
+    def watch_window(self, window: QtWidgets.QWidget) -> None:
+        if not self._windows:
+            QtWidgets.QApplication.instance().installEventFilter(self)
+        if window not in self._windows:
+            self._windows.add(window)
+            window.destroyed.connect(self._window_destroyed)
+
+    def record_paint(self, widget: QtWidgets.QWidget, duration: float) -> None:
+        names = [type(widget).__name__]
+        parent = widget.parentWidget()
+        while parent is not None and not parent.isWindow():
+            names.append(type(parent).__name__)
+            parent = parent.parentWidget()
+        self._paints["/".join(reversed(names))].add(duration)
+        if self._pending_input is not None:
+            self._latency.add(time.perf_counter() - self._pending_input)
+            self._pending_input = None
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if (
+            event.type() in _INPUT_EVENTS
+            and self._pending_input is None
+            and isinstance(obj, QtWidgets.QWidget)
+            and obj.window() in self._windows
+        ):
+            self._pending_input = time.perf_counter()
+        return False
+
+    def stats(self) -> T.Dict[str, T.Any]:
+        return {
+            "paint": {
+                name: timing.to_dict()
+                for name, timing in sorted(self._paints.items())
+            },
+            "changed": {
+                name: dict(counter.most_common())
+                for name, counter in sorted(self._emissions.items())
+            },
+            "input_to_paint": self._latency.to_dict(),
+        }
+
+    def report(self) -> str:
+        stats = self.stats()
+        lines = ["paint:"]
+        for name, timing in stats["paint"].items():
+            lines.append(
+                f"  {name:48} {timing['count']:6d}x "
+                f"{timing['mean_ms']:8.3f} ms avg "
+                f"{timing['max_ms']:8.3f} ms max"
+            )
+        lines.append("changed:")
+        for name, counter in stats["changed"].items():
+            for source, count in counter.items():
+                lines.append(f"  {name}: {count:6d}x {source}")
+        latency = stats["input_to_paint"]
+        lines.append(
+            f"input to paint: {latency['count']}x "
+            f"{latency['mean_ms']:.3f} ms avg {latency['max_ms']:.3f} ms max"
+        )
+        return "\n".join(lines)
+
+    def _record_emission(self, name: str) -> None:
+        entry = "?"
+        origin = "?"
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            frame = frame.f_back
+            if code.co_filename.endswith("contextlib.py"):
+                continue
+            if code.co_filename.endswith("color_model.py"):
+                entry = code.co_name
+            elif entry != "?":
+                origin = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                break
+        self._emissions[name][f"{entry} <- {origin}"] += 1
+
+    def unwatch_all(self) -> None:
+        for model, callback in list(self._models.items()):
+            if not sip.isdeleted(model):
+                model.changed.disconnect(callback)
+        self._models.clear()
+        app = QtWidgets.QApplication.instance()
+        if self._windows and app is not None:
+            app.removeEventFilter(self)
+        self._windows.clear()
+
+    def _window_destroyed(self) -> None:
+        for window in list(self._windows):
+            if sip.isdeleted(window):
+                self._windows.discard(window)
+        app = QtWidgets.QApplication.instance()
+        if not self._windows and app is not None and not sip.isdeleted(self):
+            app.removeEventFilter(self)
+
+
+_profiler: T.Optional[Profiler] = None
+
+
+def active_profiler() -> T.Optional[Profiler]:
+    return _profiler
+
+
+def enable() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    if _profiler is not None:
+        _profiler.unwatch_all()
+    _profiler = None
+
+
+def enabled_by_env() -> bool:
+    return bool(os.environ.get(ENV_VAR))
+
+
+def profile_paint(
+    paint_event: T.Callable[[T.Any, QtGui.QPaintEvent], None],
+) -> T.Callable[[T.Any, QtGui.QPaintEvent], None]:
+    @functools.wraps(paint_event)
+    def wrapper(widget: QtWidgets.QWidget, event: QtGui.QPaintEvent) -> None:
+        profiler = _profiler
+        if profiler is None:
+            paint_event(widget, event)
+            return
+        start = time.perf_counter()
+        paint_event(widget, event)
+        profiler.record_paint(widget, time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,55 @@
+import typing as T
+
+import numpy as np
+from PyQt5 import QtGui
+
+
+def image_from_array(
+    rgba: np.ndarray, device_pixel_ratio: float = 1.0
+) -> QtGui.QImage:
+    height, width, _ = rgba.shape
+    image = QtGui.QImage(
+        width, height, QtGui.QImage.Format_RGBA8888_Premultiplied
+    )
+    image.setDevicePixelRatio(device_pixel_ratio)
+    bits = image.bits()
+    bits.setsize(image.sizeInBytes())
+    buffer = np.frombuffer(bits, np.uint8).reshape(
+        height, image.bytesPerLine()
+    )
+    buffer[:, : width * 4] = rgba.reshape(height, width * 4)
+    return image
+
+
+def to_rgba8(rgb: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    rgba = np.empty(alpha.shape + (4,), np.float32)
+    rgba[..., :3] = rgb * alpha[..., None]
+    rgba[..., 3] = alpha
+    rgba16 = (rgba * 0xFFFF + 0.5).astype(np.uint32)
+    return ((rgba16 + 0x80 - ((rgba16 + 0x80) >> 8)) >> 8).astype(np.uint8)
+
+
+def pixel_centers(
+    width: int, height: int, device_pixel_ratio: float
+) -> T.Tuple[np.ndarray, np.ndarray]:
+    x = (np.arange(width, dtype=np.float32) + 0.5) / device_pixel_ratio
+    y = (np.arange(height, dtype=np.float32) + 0.5) / device_pixel_ratio
+    return np.meshgrid(x, y)
+
+
+def hsv_to_rgb(h: np.ndarray, s: np.ndarray, v: np.ndarray) -> np.ndarray:
+    h, s, v = np.broadcast_arrays(h, s, v)
+    h6 = (h % 1.0) * 6
+    sector = np.minimum(h6.astype(np.int8), 5)
+    f = h6 - sector
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+    return np.stack(
+        [
+            np.choose(sector, [v, q, p, p, t, v]),
+            np.choose(sector, [t, v, v, q, p, p]),
+            np.choose(sector, [p, p, t, v, v, q]),
+        ],
+        axis=-1,
+    )
@@ -0,0 +1,13 @@
+from .color_ring import render_color_ring, render_hue_ring, render_triangle
+from .color_sliders import gradient_stops, render_slider_groove
+from .color_square import ColorSquareStyle, render_square_plane
+
+__all__ = [
+    "ColorSquareStyle",
+    "gradient_stops",
+    "render_color_ring",
+    "render_hue_ring",
+    "render_slider_groove",
+    "render_square_plane",
+    "render_triangle",
+]
@@ -0,0 +1,104 @@
+import typing as T
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+DEFAULT_INTERVAL = 16
+
+
+class FrameScheduler(QtCore.QObject):
+    def __init__(
+        self,
+        parent: T.Optional[QtCore.QObject] = None,
+        interval: int = DEFAULT_INTERVAL,
+    ) -> None:
+        super().__init__(parent)
+        self._interval = interval
+        self._tasks: T.Dict[T.Hashable, T.Callable[[], None]] = {}
+        self._widgets: T.Dict[QtWidgets.QWidget, T.Optional[QtGui.QRegion]] = (
+            {}
+        )
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def interval(self) -> int:
+        return self._interval
+
+    def set_interval(self, interval: int) -> None:
+        self._interval = interval
+        if self._timer.isActive():
+            self._timer.stop()
+            self._start()
+
+    def post(self, key: T.Hashable, callback: T.Callable[[], None]) -> None:
+        self._tasks[key] = callback
+        self._start()
+
+    def cancel(self, key: T.Hashable) -> None:
+        self._tasks.pop(key, None)
+
+    def update(
+        self,
+        widget: QtWidgets.QWidget,
+        rect: T.Optional[QtCore.QRect] = None,
+    ) -> None:
+        if rect is None:
+            self._widgets[widget] = None
+        elif widget not in self._widgets:
+            self._widgets[widget] = QtGui.QRegion(rect)
+        else:
+            region = self._widgets[widget]
+            if region is not None:
+                self._widgets[widget] = region.united(rect)
+        self._start()
+
+    def flush(self) -> None:
+        self._timer.stop()
+        while self._tasks:
+            tasks = self._tasks
+            self._tasks = {}
+            for callback in tasks.values():
+                callback()
+        widgets = self._widgets
+        self._widgets = {}
+        for widget, region in widgets.items():
+            if region is None:
+                widget.update()
+            else:
+                widget.update(region)
+
+    def _start(self) -> None:
+        if self._interval <= 0:
+            self.flush()
+        elif not self._timer.isActive():
+            self._timer.start(self._interval)
+
+
+def schedule(
+    scheduler: T.Optional[FrameScheduler],
+    key: T.Hashable,
+    callback: T.Callable[[], None],
+) -> None:
+    if scheduler is None:
+        callback()
+    else:
+        scheduler.post(key, callback)
+
+
+def unschedule(scheduler: T.Optional[FrameScheduler], key: T.Hashable) -> None:
+    if scheduler is not None:
+        scheduler.cancel(key)
+
+
+def schedule_update(
+    scheduler: T.Optional[FrameScheduler],
+    widget: QtWidgets.QWidget,
+    rect: T.Optional[QtCore.QRect] = None,
+) -> None:
+    if scheduler is not None:
+        scheduler.update(widget, rect)
+    elif rect is None:
+        widget.update()
+    else:
+        widget.update(rect)
@@ -1,6 +1,204 @@
+import enum
+import typing as T
+
+import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from .color_arrays import from_linear, to_linear
 from .color_model import ColorModel
+from .scheduler import FrameScheduler, schedule, unschedule
+
+_BITS_FORMATS = {
+    QtGui.QImage.Format_RGB32,
+    QtGui.QImage.Format_ARGB32,
+    QtGui.QImage.Format_ARGB32_Premultiplied,
+}
+
+
+class SampleMethod(enum.IntEnum):
+    Mean = 1
+    Median = 2
+
+
+def _image_pixels(image: QtGui.QImage) -> np.ndarray:
+    converted = image.format() not in _BITS_FORMATS
+    if converted:
+        image = image.convertToFormat(QtGui.QImage.Format_ARGB32)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    pixels = np.frombuffer(bits, np.uint32).reshape(
+        image.height(), image.bytesPerLine() // 4
+    )[:, : image.width()]
+    return pixels.copy() if converted else pixels
+
+
+def sample_region(
+    image: QtGui.QImage,
+    center: int,
+    radius: int,
+    method: SampleMethod = SampleMethod.Mean,
+) -> QtGui.QColor:
+    if radius <= 0:
+        color = image.pixelColor(center, center)
+        return color if color.alpha() else QtGui.QColor()
+    pixels = _image_pixels(image)[
+        center - radius : center + radius + 1,
+        center - radius : center + radius + 1,
+    ].reshape(-1)
+    pixels = pixels[pixels >> 24 != 0]
+    if not len(pixels):
+        return QtGui.QColor()
+    rgb = np.stack(
+        [(pixels >> 16) & 0xFF, (pixels >> 8) & 0xFF, pixels & 0xFF], axis=-1
+    ).astype(np.uint8)
+    linear = to_linear(rgb)
+    if method == SampleMethod.Median:
+        reduced = np.median(linear, axis=0)
+    else:
+        reduced = linear.mean(axis=0)
+    return QtGui.QColor.fromRgbF(*from_linear(reduced).tolist())
+
+
+class ScreenSnapshot:
+    def __init__(self) -> None:
+        self._screens: T.List[T.Tuple[QtCore.QRect, QtGui.QImage]] = []
+
+    def capture(self) -> None:
+        self._screens = [
+            (screen.geometry(), screen.grabWindow(0).toImage())
+            for screen in QtWidgets.QApplication.screens()
+        ]
+
+    def clear(self) -> None:
+        self._screens = []
+
+    def pixel_color(self, point: QtCore.QPoint) -> T.Optional[QtGui.QColor]:
+        region = self.region(point, 0)
+        return region.pixelColor(0, 0) if region is not None else None
+
+    def region(
+        self, point: QtCore.QPoint, radius: int
+    ) -> T.Optional[QtGui.QImage]:
+        for geometry, image in self._screens:
+            if geometry.contains(point) and not image.isNull():
+                x = (point.x() - geometry.x()) * image.width()
+                y = (point.y() - geometry.y()) * image.height()
+                x = min(x // geometry.width(), image.width() - 1)
+                y = min(y // geometry.height(), image.height() - 1)
+                return _copy_padded(image, x - radius, y - radius, radius)
+        return None
+
+
+def _transparent_region(radius: int) -> QtGui.QImage:
+    size = radius * 2 + 1
+    region = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32)
+    region.fill(QtCore.Qt.transparent)
+    return region
+
+
+def _copy_padded(
+    image: QtGui.QImage, x: int, y: int, radius: int
+) -> QtGui.QImage:
+    size = radius * 2 + 1
+    rect = QtCore.QRect(x, y, size, size)
+    if image.rect().contains(rect):
+        return image.copy(rect)
+    region = _transparent_region(radius)
+    painter = QtGui.QPainter(region)
+    painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+    source = rect.intersected(image.rect())
+    painter.drawImage(source.topLeft() - rect.topLeft(), image, source)
+    painter.end()
+    return region
+
+
+def grab_region(point: QtCore.QPoint, radius: int) -> QtGui.QImage:
+    size = radius * 2 + 1
+    screen = QtWidgets.QApplication.primaryScreen()
+    rect = QtCore.QRect(point.x() - radius, point.y() - radius, size, size)
+    clipped = rect.intersected(screen.virtualGeometry())
+    if clipped.isEmpty():
+        return _transparent_region(radius)
+    image = screen.grabWindow(
+        QtWidgets.QApplication.desktop().winId(),
+        rect.x(),
+        rect.y(),
+        size,
+        size,
+    ).toImage()
+    if image.isNull():
+        return image
+    x = (point.x() - clipped.x()) * image.width() // clipped.width()
+    y = (point.y() - clipped.y()) * image.height() // clipped.height()
+    return _copy_padded(image, x - radius, y - radius, radius)
+
+
+class ScreenColorLoupe(QtWidgets.QWidget):
+    def __init__(
+        self, parent: QtWidgets.QWidget, radius: int = 7, zoom: int = 8
+    ) -> None:
+        super().__init__(
+            parent,
+            QtCore.Qt.ToolTip
+            | QtCore.Qt.FramelessWindowHint
+            | QtCore.Qt.WindowStaysOnTopHint,
+        )
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(QtCore.Qt.WA_ShowWithoutActivating)
+        self._radius = radius
+        self._zoom = zoom
+        size = (radius * 2 + 1) * zoom
+        self._image = QtGui.QImage(size, size, QtGui.QImage.Format_RGB32)
+        self._image.fill(0)
+        bits = self._image.bits()
+        bits.setsize(self._image.sizeInBytes())
+        self._pixels = np.frombuffer(bits, np.uint32).reshape(
+            size, self._image.bytesPerLine() // 4
+        )[:, :size]
+        self._index = np.arange(size) // zoom
+        self.setFixedSize(size, size)
+
+    @property
+    def radius(self) -> int:
+        return self._radius
+
+    def set_source(self, image: QtGui.QImage) -> None:
+        offset = (image.width() - self._index[-1] - 1) // 2
+        index = self._index + offset
+        np.bitwise_or(
+            _image_pixels(image)[index[:, None], index[None, :]],
+            0xFF000000,
+            out=self._pixels,
+        )
+        self.update()
+
+    def follow(self, point: QtCore.QPoint, margin: int = 0) -> None:
+        offset = max(self._zoom * 2, margin + 1)
+        pos = point + QtCore.QPoint(offset, offset)
+        screen = QtWidgets.QApplication.screenAt(point)
+        if screen is not None:
+            available = screen.availableGeometry()
+            if pos.x() + self.width() > available.right():
+                pos.setX(point.x() - offset - self.width())
+            if pos.y() + self.height() > available.bottom():
+                pos.setY(point.y() - offset - self.height())
+        self.move(pos)
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self)
+        painter.drawImage(0, 0, self._image)
+        center = QtCore.QRect(
+            self._radius * self._zoom,
+            self._radius * self._zoom,
+            self._zoom,
+            self._zoom,
+        )
+        painter.setPen(QtCore.Qt.black)
+        painter.drawRect(center.adjusted(-1, -1, 0, 0))
+        painter.setPen(QtCore.Qt.white)
+        painter.drawRect(center.adjusted(-2, -2, 1, 1))
+        painter.setPen(QtCore.Qt.black)
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
 
 
 class ColorPickingEventFilter(QtCore.QObject):
@@ -21,10 +219,28 @@ class ColorPickingEventFilter(QtCore.QObject):
 
 
 class ScreenColorPicker(QtCore.QObject):
-    def __init__(self, model: ColorModel, parent: QtWidgets.QWidget) -> None:
+    def __init__(
+        self,
+        model: ColorModel,
+        parent: QtWidgets.QWidget,
+        use_snapshot: bool = True,
+        refresh_interval: int = 0,
+        scheduler: T.Optional[FrameScheduler] = None,
+    ) -> None:
         super().__init__(parent)
         self._model = model
         self._parent = parent
+        self._scheduler = scheduler
+        self._use_snapshot = use_snapshot
+        self._use_loupe = True
+        self._sample_size = 1
+        self._sample_method = SampleMethod.Mean
+        self._loupe: T.Optional[ScreenColorLoupe] = None
+        self._pending_pos = QtCore.QPoint()
+        self._snapshot = ScreenSnapshot()
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setInterval(refresh_interval)
+        self._refresh_timer.timeout.connect(self._snapshot.capture)
         self._dummy_transparent_window = QtGui.QWindow()
         self._dummy_transparent_window.resize(1, 1)
         self._dummy_transparent_window.setFlags(
@@ -33,15 +249,63 @@ class ScreenColorPicker(QtCore.QObject):
         self._color_picking_event_filter = ColorPickingEventFilter(self)
         self._old_color = QtGui.QColor()
 
+    @property
+    def use_snapshot(self) -> bool:
+        return self._use_snapshot
+
+    def set_use_snapshot(self, use_snapshot: bool) -> None:
+        self._use_snapshot = use_snapshot
+
+    @property
+    def use_loupe(self) -> bool:
+        return self._use_loupe
+
+    def set_use_loupe(self, use_loupe: bool) -> None:
+        self._use_loupe = use_loupe
+        if not use_loupe and self._loupe is not None:
+            self._loupe.hide()
+
+    @property
+    def sample_size(self) -> int:
+        return self._sample_size
+
+    def set_sample_size(self, sample_size: int) -> None:
+        self._sample_size = max(1, sample_size) | 1
+
+    @property
+    def sample_method(self) -> SampleMethod:
+        return self._sample_method
+
+    def set_sample_method(self, sample_method: SampleMethod) -> None:
+        self._sample_method = sample_method
+
+    @property
+    def refresh_interval(self) -> int:
+        return self._refresh_timer.interval()
+
+    def set_refresh_interval(self, refresh_interval: int) -> None:
+        self._refresh_timer.setInterval(refresh_interval)
+
     def pick_screen_color(self) -> None:
         self._old_color = self._model.color
+        if self._use_snapshot:
+            self._snapshot.capture()
+            if self._refresh_timer.interval() > 0:
+                self._refresh_timer.start()
         self._dummy_transparent_window.show()
         self._parent.installEventFilter(self._color_picking_event_filter)
         self._parent.grabMouse(QtCore.Qt.CrossCursor)
         self._parent.grabKeyboard()
         self._parent.setMouseTracking(True)
+        if self._use_loupe and self._loupe is None:
+            self._loupe = ScreenColorLoupe(self._parent)
 
     def _release(self) -> None:
+        unschedule(self._scheduler, self)
+        if self._loupe is not None:
+            self._loupe.hide()
+        self._refresh_timer.stop()
+        self._snapshot.clear()
         self._dummy_transparent_window.setVisible(False)
         self._parent.removeEventFilter(self._color_picking_event_filter)
         self._parent.releaseMouse()
@@ -49,11 +313,14 @@ class ScreenColorPicker(QtCore.QObject):
         self._parent.setMouseTracking(False)
 
     def handle_mouse_move(self, event: QtGui.QMouseEvent) -> bool:
-        self._model.color = self._grab_screen_color(event.globalPos())
+        self._pending_pos = event.globalPos()
+        if self._loupe is not None and self._loupe.isVisible():
+            self._loupe.follow(self._pending_pos, self._grab_radius())
+        schedule(self._scheduler, self, self._sample_pending)
         return True
 
     def handle_mouse_button_release(self, event: QtGui.QMouseEvent) -> bool:
-        self._model.color = self._grab_screen_color(event.globalPos())
+        self._sample(event.globalPos())
         self._release()
         return True
 
@@ -62,14 +329,41 @@ class ScreenColorPicker(QtCore.QObject):
             self._release()
             self._model.color = self._old_color
         elif event.key() in {QtCore.Qt.Key_Return, QtCore.Qt.Key_Enter}:
-            self._model.color = self._grab_screen_color(QtGui.QCursor.pos())
+            self._sample(QtGui.QCursor.pos())
             self._release()
         event.accept()
         return True
 
-    def _grab_screen_color(self, point: QtCore.QPoint) -> QtGui.QColor:
-        desktop = QtWidgets.QApplication.desktop()
-        pixmap = QtWidgets.QApplication.primaryScreen().grabWindow(
-            desktop.winId(), point.x(), point.y(), 1, 1
+    def _sample_pending(self) -> None:
+        self._sample(self._pending_pos)
+        loupe = self._loupe if self._use_loupe else None
+        if loupe is not None and not loupe.isVisible():
+            loupe.follow(self._pending_pos, self._grab_radius())
+            loupe.show()
+
+    def _sample(self, point: QtCore.QPoint) -> None:
+        loupe = self._loupe if self._use_loupe else None
+        radius = self._grab_radius()
+        region = self._grab_region(point, radius)
+        if region.isNull():
+            return
+        if loupe is not None:
+            loupe.set_source(region)
+        color = sample_region(
+            region, radius, self._sample_size // 2, self._sample_method
         )
-        return pixmap.toImage().pixelColor(0, 0)
+        if color.isValid():
+            self._model.color = color
+
+    def _grab_radius(self) -> int:
+        loupe = self._loupe if self._use_loupe else None
+        return max(
+            self._sample_size // 2, loupe.radius if loupe is not None else 0
+        )
+
+    def _grab_region(self, point: QtCore.QPoint, radius: int) -> QtGui.QImage:
+        if self._use_snapshot:
+            region = self._snapshot.region(point, radius)
+            if region is not None:
+                return region
+        return grab_region(point, radius)
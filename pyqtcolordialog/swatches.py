@@ -0,0 +1,139 @@
+import typing as T
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from .alpha_grid import AlphaGrid
+from .color_arrays import to_argb32
+from .color_model import ColorModel
+from .palette import Palette
+from .profiling import profile_paint
+
+
+class SwatchArea(QtWidgets.QAbstractScrollArea):
+    _cell_size = 16
+    _visible_rows = 4
+
+    def __init__(
+        self,
+        parent: QtWidgets.QWidget,
+        model: ColorModel,
+        alpha_grid: AlphaGrid,
+    ) -> None:
+        super().__init__(parent)
+        self._model = model
+        self._alpha_grid = alpha_grid
+        self._alpha_grid.changed.connect(self.viewport().update)
+        self._palette: T.Optional[Palette] = None
+        self._argb: T.List[int] = []
+
+        self.setFrameStyle(QtWidgets.QFrame.Panel | QtWidgets.QFrame.Sunken)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+        self.setSizePolicy(
+            QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed
+        )
+        self.viewport().setMouseTracking(True)
+
+    def sizeHint(self) -> QtCore.QSize:
+        return QtCore.QSize(
+            300,
+            self._cell_size * self._visible_rows + self.frameWidth() * 2,
+        )
+
+    @property
+    def swatch_palette(self) -> T.Optional[Palette]:
+        return self._palette
+
+    def set_swatch_palette(self, palette: T.Optional[Palette]) -> None:
+        self._palette = palette
+        self._argb = (
+            to_argb32(palette.colors).tolist() if palette is not None else []
+        )
+        self.verticalScrollBar().setValue(0)
+        self._update_scroll_bar()
+        self.viewport().update()
+
+    @profile_paint
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self.viewport())
+        painter.drawPixmap(
+            0,
+            0,
+            self._alpha_grid.tiled(
+                self.viewport().size(), self.devicePixelRatioF()
+            ),
+        )
+        if not self._argb:
+            return
+
+        cell = self._cell_size
+        columns = self._columns
+        offset = self.verticalScrollBar().value()
+        rect = event.rect()
+        first_row = (offset + rect.top()) // cell
+        last_row = (offset + rect.bottom()) // cell
+        first_column = rect.left() // cell
+        last_column = min(columns - 1, rect.right() // cell)
+        for row in range(first_row, last_row + 1):
+            y = row * cell - offset
+            for column in range(first_column, last_column + 1):
+                index = row * columns + column
+                if index >= len(self._argb):
+                    return
+                painter.fillRect(
+                    column * cell,
+                    y,
+                    cell - 1,
+                    cell - 1,
+                    QtGui.QColor.fromRgba(self._argb[index]),
+                )
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._update_scroll_bar()
+
+    def viewportEvent(self, event: QtCore.QEvent) -> bool:
+        if event.type() == QtCore.QEvent.ToolTip:
+            index = self._index_at(event.pos())
+            if index is None:
+                QtWidgets.QToolTip.hideText()
+            else:
+                color = self._palette.color(index)
+                text = color.name().upper()
+                name = self._palette.name(index)
+                if name and name.upper() != text:
+                    text = f"{name} ({text})"
+                QtWidgets.QToolTip.showText(
+                    event.globalPos(), text, self.viewport()
+                )
+            return True
+        return super().viewportEvent(event)
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        index = self._index_at(event.pos())
+        if event.button() != QtCore.Qt.LeftButton or index is None:
+            event.ignore()
+            return
+        event.accept()
+        self._model.color = self._palette.color(index)
+
+    @property
+    def _columns(self) -> int:
+        return max(1, self.viewport().width() // self._cell_size)
+
+    def _index_at(self, pos: QtCore.QPoint) -> T.Optional[int]:
+        column = pos.x() // self._cell_size
+        row = (pos.y() + self.verticalScrollBar().value()) // self._cell_size
+        index = row * self._columns + column
+        if column >= self._columns or not 0 <= index < len(self._argb):
+            return None
+        return index
+
+    def _update_scroll_bar(self) -> None:
+        rows = -(-len(self._argb) // self._columns)
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setRange(
+            0, max(0, rows * self._cell_size - self.viewport().height())
+        )
+        scroll_bar.setSingleStep(self._cell_size)
+        scroll_bar.setPageStep(self.viewport().height())
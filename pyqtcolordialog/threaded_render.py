@@ -0,0 +1,137 @@
+import atexit
+import sys
+import typing as T
+import weakref
+
+from PyQt5 import QtCore, QtGui, sip
+
+RenderKey = T.Tuple[T.Any, ...]
+
+_used_pools: T.MutableSet[QtCore.QThreadPool] = weakref.WeakSet()
+_jobs: T.Set["_RenderJob"] = set()
+
+
+@atexit.register
+def _wait_for_jobs() -> None:
+    for thread_pool in list(_used_pools):
+        if not sip.isdeleted(thread_pool):
+            thread_pool.waitForDone()
+
+
+class _RenderSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(int, object)
+
+
+class _RenderJob(QtCore.QRunnable):
+    def __init__(
+        self,
+        render: T.Callable[..., QtGui.QImage],
+        key: RenderKey,
+        job_id: int,
+    ) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = _RenderSignals()
+        self.key = key
+        self.job_id = job_id
+        self.cancelled = False
+        self._render = render
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def run(self) -> None:
+        image: T.Optional[QtGui.QImage] = None
+        if not self.cancelled:
+            try:
+                image = self._render(*self.key)
+            except Exception:
+                sys.excepthook(*sys.exc_info())
+        self.signals.finished.emit(self.job_id, image)
+        _jobs.discard(self)
+
+
+class ThreadedRenderer(QtCore.QObject):
+    ready = QtCore.pyqtSignal()
+
+    def __init__(
+        self,
+        render: T.Callable[..., QtGui.QImage],
+        thread_pool: T.Optional[QtCore.QThreadPool] = None,
+        parent: T.Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._render = render
+        self._thread_pool = thread_pool
+        self._key: T.Optional[RenderKey] = None
+        self._image: T.Optional[QtGui.QImage] = None
+        self._invalid = False
+        self._job: T.Optional[_RenderJob] = None
+        self._job_id = 0
+        self._failed_key: T.Optional[RenderKey] = None
+
+    @property
+    def thread_pool(self) -> T.Optional[QtCore.QThreadPool]:
+        return self._thread_pool
+
+    def set_thread_pool(
+        self, thread_pool: T.Optional[QtCore.QThreadPool]
+    ) -> None:
+        self._cancel()
+        self._thread_pool = thread_pool
+
+    @property
+    def key(self) -> T.Optional[RenderKey]:
+        return self._key
+
+    def invalidate(self) -> None:
+        self._invalid = True
+        self._failed_key = None
+
+    def image(self, key: RenderKey) -> QtGui.QImage:
+        if key == self._key and not self._invalid:
+            self._cancel()
+        elif self._thread_pool is None or self._image is None:
+            self._cancel()
+            self._image = self._render(*key)
+            self._key = key
+            self._invalid = False
+        elif key != self._failed_key and (
+            self._job is None or self._job.key != key
+        ):
+            self._cancel()
+            self._start(key)
+        return self._image
+
+    def _start(self, key: RenderKey) -> None:
+        self._job_id += 1
+        job = _RenderJob(self._render, key, self._job_id)
+        job.signals.finished.connect(self._finished)
+        self._job = job
+        _jobs.add(job)
+        _used_pools.add(self._thread_pool)
+        self._thread_pool.start(job)
+
+    def _cancel(self) -> None:
+        job = self._job
+        if job is None:
+            return
+        self._job = None
+        if self._thread_pool is not None and self._thread_pool.tryTake(job):
+            _jobs.discard(job)
+        else:
+            job.cancel()
+
+    def _finished(self, job_id: int, image: T.Optional[QtGui.QImage]) -> None:
+        job = self._job
+        if job is None or job.job_id != job_id:
+            return
+        self._job = None
+        if image is None:
+            self._failed_key = job.key
+            return
+        self._key = job.key
+        self._image = image
+        self._invalid = False
+        self._failed_key = None
+        self.ready.emit()
@@ -1,4 +1,4 @@
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtWidgets
 
 
 def is_precise_click(
@@ -17,13 +17,5 @@ def is_imprecise_click(
     ) == button
 
 
-def blend(c1: QtGui.QColor, c2: QtGui.QColor, ratio: float) -> QtGui.QColor:
-    return QtGui.QColor.fromRgbF(
-        c1.redF() * (1 - ratio) + c2.redF() * ratio,
-        c1.greenF() * (1 - ratio) + c2.greenF() * ratio,
-        c1.blueF() * (1 - ratio) + c2.blueF() * ratio,
-    )
-
-
 def clamp(val: float, min_val: float, max_val: float) -> float:
-    return max(min_val, min(max_val, val))
+    return min_val if val < min_val else max_val if val > max_val else val
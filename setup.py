@@ -8,7 +8,8 @@ setup(
     version="0.3",
     url="https://github.com/rr-/pyqtcolordialog",
     packages=find_packages(),
-    install_requires=["PyQt5"],
+    python_requires=">=3.7",
+    install_requires=["PyQt5", "numpy"],
     package_dir={"pyqtcolordialog": "pyqtcolordialog"},
     package_data={"pyqtcolordialog": ["*.png", "../LICENSE.md"]},
     classifiers=[